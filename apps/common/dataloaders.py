@@ -0,0 +1,151 @@
+import dataclasses
+import functools
+import time
+import typing
+from concurrent.futures import ThreadPoolExecutor
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.core.files.storage import default_storage
+from django.utils.functional import cached_property
+
+from main.caches import CacheKey, TwoTierCache
+from utils.strawberry.dataloaders import InstrumentedDataLoader
+
+
+@functools.lru_cache(maxsize=4096)
+def generate_file_name_hash(name: str) -> str:
+    # Same file names are resolved across the requests (eg: avatars), hashed once per process
+    return CacheKey.generate_hash(name)
+
+
+@dataclasses.dataclass
+class FileUrlCacheStats:
+    hits: int = 0
+    stale_hits: int = 0  # Served and refreshed in the background
+    misses: int = 0  # Signed in the request
+    refreshes: int = 0  # Signed in the background
+
+    @property
+    def signatures_saved(self) -> int:
+        # Cached URLs served without signing in the request
+        return self.hits + self.stale_hits
+
+    def as_dict(self) -> dict:
+        return {
+            **dataclasses.asdict(self),
+            'signatures_saved': self.signatures_saved,
+        }
+
+
+class FileUrlCache:
+    """
+    Cross-request cache for the storage URLs: Redis
+    - Each entry has the signature expiry, the entries are never served within MEDIA_FILE_URL_EXPIRY_MARGIN of it
+    - Entries within MEDIA_FILE_URL_REFRESH_AHEAD of the expiry are served and refreshed in the background
+    """
+    cache: TwoTierCache[str, tuple[str, float | None]] = TwoTierCache(
+        CacheKey.URL_CACHED_FILE_FIELD_NAMESPACE,
+        hash_keys=True,
+        hash_function=generate_file_name_hash,
+    )
+    stats = FileUrlCacheStats()
+    # NOTE: Signing is local (No network call for S3), a single worker is enough for the refresh
+    refresh_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='file-url-refresh')
+
+    @staticmethod
+    def get_refresh_lock_cache_key(name: str) -> str:
+        return CacheKey.URL_CACHED_FILE_FIELD_REFRESH_LOCK_KEY_FORMAT.format(generate_file_name_hash(name))
+
+    @staticmethod
+    def get_signature_ttl() -> int | None:
+        # Same as the storage's signature expiry (AWS_S3_QUERYSTRING_EXPIRE for S3MediaStorage)
+        if getattr(default_storage, 'querystring_auth', False):
+            return default_storage.querystring_expire
+        return None
+
+    @classmethod
+    def get_many(cls, names: typing.Iterable[str]) -> dict[str, str]:
+        names = list(dict.fromkeys(names))
+        entries = cls.cache.get_many(names)
+        now = time.time()
+        urls = {}
+        stale_names = []
+        for name, (url, expires_at) in entries.items():
+            if expires_at is not None:
+                remaining = expires_at - now
+                if remaining < settings.MEDIA_FILE_URL_EXPIRY_MARGIN:
+                    # NOTE: Should be already dropped using the cache TTL, just in case of a clock skew
+                    continue
+                if remaining < settings.MEDIA_FILE_URL_REFRESH_AHEAD:
+                    stale_names.append(name)
+            urls[name] = url
+        cls.stats.hits += len(urls) - len(stale_names)
+        cls.stats.stale_hits += len(stale_names)
+        cls.stats.misses += len(names) - len(urls)
+        if stale_names:
+            cls.schedule_refresh(stale_names)
+        return urls
+
+    @classmethod
+    def sign_many(cls, names: typing.Iterable[str]) -> dict[str, str]:
+        """
+        Sign the URLs using the storage and write back with the expiry using a single MSET
+        """
+        signature_ttl = cls.get_signature_ttl()
+        # Before signing, so that the expiry is never later than the actual one
+        now = time.time()
+        urls = {
+            name: default_storage.url(name)
+            for name in names
+        }
+        if signature_ttl is None:
+            expires_at, timeout = None, settings.MEDIA_FILE_CACHE_URL_TTL
+        else:
+            expires_at, timeout = now + signature_ttl, signature_ttl - settings.MEDIA_FILE_URL_EXPIRY_MARGIN
+        if urls and timeout > 0:
+            cls.cache.set_many(
+                {
+                    name: (url, expires_at)
+                    for name, url in urls.items()
+                },
+                timeout=timeout,
+            )
+        return urls
+
+    @classmethod
+    def refresh(cls, names: list[str]):
+        cls.sign_many(names)
+        cls.stats.refreshes += len(names)
+
+    @classmethod
+    def schedule_refresh(cls, names: list[str]):
+        # Only one process refreshes the URL (Others keep serving the cached URL)
+        if names := [
+            name
+            for name in names
+            if cache.add(cls.get_refresh_lock_cache_key(name), 1, settings.MEDIA_FILE_URL_REFRESH_LOCK_TTL)
+        ]:
+            cls.refresh_executor.submit(cls.refresh, names)
+
+    @classmethod
+    def clear(cls):
+        cls.stats = FileUrlCacheStats()
+
+
+def load_file_urls(keys: list[str]) -> list[str]:
+    """
+    Signed URLs for the storage file names: Redis (single MGET) -> Storage
+    Missing URLs are signed locally (No network call for S3) and written back using a single MSET
+    """
+    _map = FileUrlCache.get_many(keys)
+    if missing_keys := [name for name in dict.fromkeys(keys) if name not in _map]:
+        _map.update(FileUrlCache.sign_many(missing_keys))
+    return [_map[key] for key in keys]
+
+
+class CommonDataLoader():
+    @cached_property
+    def load_file_urls(self) -> InstrumentedDataLoader:
+        return InstrumentedDataLoader(load_fn=sync_to_async(load_file_urls))
@@ -0,0 +1,34 @@
+import argparse
+import json
+
+from django.core.management.base import BaseCommand
+
+from main.graphql.persisted_queries import PersistedQueryRegistry, get_query_hash
+
+
+class Command(BaseCommand):
+    help = 'Load persisted (allow-listed) GraphQL queries from the frontend manifest'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'manifest',
+            type=argparse.FileType('r'),
+            help=(
+                'Apollo persisted query manifest ({"operations": [{"body": ...}, ...]})'
+                ' or a {"<sha256>": "<query>"} mapping'
+            ),
+        )
+
+    def handle(self, *args, **options):
+        file = options['manifest']
+        manifest = json.load(file)
+        file.close()
+        if 'operations' in manifest:
+            queries = {
+                get_query_hash(operation['body']): operation['body']
+                for operation in manifest['operations']
+            }
+        else:
+            queries = manifest
+        PersistedQueryRegistry.persist_many(queries)
+        self.stdout.write(self.style.SUCCESS(f'{len(queries)} persisted queries loaded'))
@@ -1,5 +1,11 @@
+import time
+import typing
+
+from django.conf import settings
+from django.core.cache import cache
 from django.db import models
 
+from main.caches import CacheKey, TwoTierCache
 from apps.user.models import User
 
 
@@ -41,3 +47,51 @@ class GlobalPermission(models.Model):
         if self.users.filter(pk=user.id).exists():
             return
         self.users.add(user)
+
+
+class GlobalPermissionCache:
+    """
+    Cross-request cache for User.get_global_permissions: Local LRU -> Redis -> DB
+    Entries are keyed by a per-user version, which is bumped on GlobalPermission.users changes (Check signals)
+    """
+    cache: TwoTierCache[tuple[int, typing.Any], list[str]] = TwoTierCache(
+        CacheKey.GLOBAL_PERMISSION_NAMESPACE,
+        timeout=settings.GLOBAL_PERMISSION_CACHE_TTL,
+        local_maxsize=settings.GLOBAL_PERMISSION_LOCAL_CACHE_MAXSIZE,
+        local_ttl=settings.GLOBAL_PERMISSION_LOCAL_CACHE_TTL,
+    )
+
+    @staticmethod
+    def get_version_cache_key(user_id: int) -> str:
+        return CacheKey.GLOBAL_PERMISSION_VERSION_KEY_FORMAT.format(user_id)
+
+    @classmethod
+    def get_version(cls, user_id: int):
+        version_key = cls.get_version_cache_key(user_id)
+        if (version := cache.get(version_key)) is None:
+            # NOTE: Not using a counter, a evicted version should not match the old entries
+            cache.add(version_key, time.time_ns(), None)
+            version = cache.get(version_key)
+        return version
+
+    @classmethod
+    def bump_version(cls, user_ids: typing.Iterable[int]):
+        version = time.time_ns()
+        cache.set_many(
+            {
+                cls.get_version_cache_key(user_id): version
+                for user_id in user_ids
+            },
+            None,
+        )
+
+    @classmethod
+    def get(cls, user: User) -> set[GlobalPermission.Type]:
+        types = cls.cache.get_or_set(
+            (user.pk, cls.get_version(user.pk)),
+            lambda: [_type.value for _type in user.get_global_permissions()],
+        )
+        return set([
+            GlobalPermission.Type(_type)
+            for _type in types
+        ])
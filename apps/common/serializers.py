@@ -1,7 +1,8 @@
+import typing
+
 from django.utils.functional import cached_property
 from rest_framework import serializers
 
-from main.caches import local_cache, CacheKey
 from utils.strawberry.serializers import StringIDField
 
 
@@ -31,32 +32,50 @@ class UserResourceSerializer(serializers.ModelSerializer):
         return super().update(instance, validated_data)
 
 
+class ClientIdRegistry:
+    """
+    Request scoped client ids for the created/updated instances (Check GraphQLContext.client_ids)
+    Keyed by the identity (model, pk), the instances are not retained.
+    NOTE: Nothing is allocated until a client id is provided
+    """
+    __slots__ = ('_client_ids',)
+
+    def __init__(self):
+        self._client_ids: dict[tuple[type, typing.Any], str] | None = None
+
+    def set(self, instance, client_id: str):
+        if self._client_ids is None:
+            self._client_ids = {}
+        self._client_ids[(type(instance), instance.pk)] = client_id
+
+    def get(self, instance) -> str | None:
+        if self._client_ids is None:
+            return None
+        return self._client_ids.get((type(instance), instance.pk))
+
+
 class TempClientIdMixin(serializers.ModelSerializer):
     """
     ClientId for serializer level only, storing to database is optional (if field exists).
+    NOTE: Registered using client_ids in the serializer context (Check GraphQLContext.get_serializer_context)
+    Not registered without it (eg: serializers used outside of GraphQL)
     """
     client_id = StringIDField(required=False)
 
-    @staticmethod
-    def get_cache_key(instance, request):
-        return CacheKey.TEMP_CLIENT_ID_KEY_FORMAT.format(
-            request_hash=hash(request),
-            instance_type=type(instance).__name__,
-            instance_id=instance.pk,
-        )
+    def set_temp_client_id(self, instance, temp_client_id: str | None):
+        if temp_client_id:
+            instance.client_id = temp_client_id
+            if (client_ids := self.context.get('client_ids')) is not None:
+                client_ids.set(instance, temp_client_id)
 
     def create(self, validated_data):
         temp_client_id = validated_data.pop('client_id', None)
         instance = super().create(validated_data)
-        if temp_client_id:
-            instance.client_id = temp_client_id
-            local_cache.set(self.get_cache_key(instance, self.context['request']), temp_client_id, 60)
+        self.set_temp_client_id(instance, temp_client_id)
         return instance
 
     def update(self, instance, validated_data):
         temp_client_id = validated_data.pop('client_id', None)
         instance = super().update(instance, validated_data)
-        if temp_client_id:
-            instance.client_id = temp_client_id
-            local_cache.set(self.get_cache_key(instance, self.context['request']), temp_client_id, 60)
+        self.set_temp_client_id(instance, temp_client_id)
         return instance
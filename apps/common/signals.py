@@ -0,0 +1,32 @@
+from django.db import transaction
+from django.db.models.signals import m2m_changed, pre_delete
+from django.dispatch import receiver
+
+from .models import GlobalPermission, GlobalPermissionCache
+
+
+def bump_global_permission_version(user_ids):
+    user_ids = list(user_ids)
+    if user_ids:
+        # Bump again after commit, a request in between can cache the old permissions
+        GlobalPermissionCache.bump_version(user_ids)
+        transaction.on_commit(lambda: GlobalPermissionCache.bump_version(user_ids))
+
+
+@receiver(m2m_changed, sender=GlobalPermission.users.through)
+def global_permission_users_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in ['post_add', 'post_remove', 'pre_clear']:
+        return
+    if reverse:
+        # user.globalpermission_set.add/remove/clear
+        user_ids = [instance.pk]
+    elif action == 'pre_clear':
+        user_ids = instance.users.values_list('id', flat=True)
+    else:
+        user_ids = pk_set or []
+    bump_global_permission_version(user_ids)
+
+
+@receiver(pre_delete, sender=GlobalPermission)
+def global_permission_deleted(sender, instance, **kwargs):
+    bump_global_permission_version(instance.users.values_list('id', flat=True))
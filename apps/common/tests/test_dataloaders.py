@@ -0,0 +1,74 @@
+import itertools
+import time
+from unittest import mock
+
+from django.conf import settings
+from django.core.cache import cache
+
+from main.tests import TestCase
+
+from apps.common.dataloaders import generate_file_name_hash, load_file_urls, FileUrlCache
+
+
+class TestCommonDataLoader(TestCase):
+    SIGNATURE_TTL = 60 * 60 * 24 * 2
+
+    def setUp(self):
+        super().setUp()
+        # Each signature is unique
+        signature_counter = itertools.count()
+        storage_patcher = mock.patch('apps.common.dataloaders.default_storage')
+        self.storage_mock = storage_patcher.start()
+        self.storage_mock.querystring_auth = True
+        self.storage_mock.querystring_expire = self.SIGNATURE_TTL
+        self.storage_mock.url.side_effect = lambda name: f'https://signed/{name}?s={next(signature_counter)}'
+        self.addCleanup(storage_patcher.stop)
+        # Refresh in the same thread
+        executor_patcher = mock.patch.object(FileUrlCache, 'refresh_executor')
+        executor_patcher.start().submit.side_effect = lambda func, *args: func(*args)
+        self.addCleanup(executor_patcher.stop)
+
+    def test_load_file_urls(self):
+        generate_file_name_hash.cache_clear()
+        # Signed using the storage
+        with mock.patch.object(cache, 'get_many', wraps=cache.get_many) as get_many_mock:
+            assert load_file_urls(['a.png', 'b.png', 'a.png']) == [
+                'https://signed/a.png?s=0',
+                'https://signed/b.png?s=1',
+                'https://signed/a.png?s=0',
+            ]
+        assert get_many_mock.call_count == 1
+
+        # Fetched from redis, only the new files are signed
+        assert load_file_urls(['b.png', 'c.png', 'a.png']) == [
+            'https://signed/b.png?s=1',
+            'https://signed/c.png?s=2',
+            'https://signed/a.png?s=0',
+        ]
+        assert self.storage_mock.url.call_count == 3
+        # Repeated file names are hashed once
+        assert generate_file_name_hash.cache_info().misses == 3
+        assert FileUrlCache.stats.as_dict() == {
+            'hits': 2,
+            'stale_hits': 0,
+            'misses': 3,
+            'refreshes': 0,
+            'signatures_saved': 2,
+        }
+
+    def test_load_file_urls_expiry(self):
+        now = time.time()
+        load_file_urls(['a.png'])
+        with mock.patch('apps.common.dataloaders.time.time') as time_mock:
+            # Within the refresh window: Cached URL is served and refreshed in the background
+            time_mock.return_value = now + self.SIGNATURE_TTL - settings.MEDIA_FILE_URL_REFRESH_AHEAD + 1
+            assert load_file_urls(['a.png']) == ['https://signed/a.png?s=0']
+            assert FileUrlCache.stats.stale_hits == 1
+            assert FileUrlCache.stats.refreshes == 1
+            assert load_file_urls(['a.png']) == ['https://signed/a.png?s=1']
+            assert FileUrlCache.stats.hits == 1
+
+            # Near the expiry of the refreshed signature: Never served
+            time_mock.return_value += self.SIGNATURE_TTL - settings.MEDIA_FILE_URL_EXPIRY_MARGIN + 1
+            assert load_file_urls(['a.png']) == ['https://signed/a.png?s=2']
+            assert FileUrlCache.stats.misses == 2
@@ -0,0 +1,53 @@
+from main.tests import TestCase
+
+from apps.common.serializers import ClientIdRegistry, TempClientIdMixin
+from apps.user.factories import UserFactory
+from apps.user.models import User
+
+
+class UserClientIdSerializer(TempClientIdMixin):
+    class Meta:
+        model = User
+        fields = ('first_name', 'client_id')
+
+
+class TestTempClientIdMixin(TestCase):
+    def test_client_id_registry(self):
+        user1, user2 = UserFactory.create_batch(2)
+        client_ids = ClientIdRegistry()
+
+        # Nothing is allocated without client_id
+        serializer = UserClientIdSerializer(
+            instance=user1,
+            data={'first_name': 'Updated'},
+            context={'client_ids': client_ids},
+        )
+        assert serializer.is_valid()
+        serializer.save()
+        assert client_ids._client_ids is None
+        assert client_ids.get(user1) is None
+
+        serializer = UserClientIdSerializer(
+            instance=user1,
+            data={'first_name': 'Updated', 'client_id': 'client-id-1'},
+            context={'client_ids': client_ids},
+        )
+        assert serializer.is_valid()
+        instance = serializer.save()
+        assert instance.client_id == 'client-id-1'
+        # Keyed by the identity, not the instance
+        assert client_ids.get(User.objects.get(pk=user1.pk)) == 'client-id-1'
+        assert client_ids.get(user2) is None
+        # Request scoped
+        assert ClientIdRegistry().get(user1) is None
+
+    def test_without_client_id_registry(self):
+        user = UserFactory.create()
+        # eg: Used outside of GraphQL
+        serializer = UserClientIdSerializer(
+            instance=user,
+            data={'first_name': 'Updated', 'client_id': 'client-id-1'},
+        )
+        assert serializer.is_valid()
+        instance = serializer.save()
+        assert instance.client_id == 'client-id-1'
@@ -3,13 +3,9 @@ import datetime
 from strawberry.types import Info
 from django.db import models
 from django.db.models.fields.files import FieldFile as DjFieldFile
-from django.http import HttpRequest
 from django.core.files.storage import FileSystemStorage, default_storage
-from django.core.cache import cache
-from django.conf import settings
 
-from main.caches import local_cache, CacheKey
-from apps.common.serializers import TempClientIdMixin
+from utils.strawberry.cost import FieldCost, field_cost
 from apps.user.types import UserType
 
 
@@ -20,7 +16,7 @@ class ClientIdMixin:
         # NOTE: We should always provide non-null client_id
         return strawberry.ID(
             getattr(self, 'client_id', None) or
-            local_cache.get(TempClientIdMixin.get_cache_key(self, info.context.request)) or
+            info.context.client_ids.get(self) or
             str(self.id)
         )
 
@@ -30,27 +26,16 @@ class UserResourceTypeMixin:
     modified_at: datetime.datetime
 
     @strawberry.field
+    @field_cost(FieldCost.DATALOADER)
     def created_by(self, info: Info) -> UserType:
         return info.context.dl.user.load_users.load(self.created_by_id)
 
     @strawberry.field
+    @field_cost(FieldCost.DATALOADER)
     def modified_by(self, info: Info) -> UserType:
         return info.context.dl.user.load_users.load(self.modified_by_id)
 
 
-def get_cached_file_uri(file: DjFieldFile, request: HttpRequest) -> str | None:
-    if file.name is None:
-        return
-    if isinstance(default_storage, FileSystemStorage):
-        return request.build_absolute_uri(file.url)
-    # Other is only S3 for now
-    cache_key = CacheKey.URL_CACHED_FILE_FIELD_KEY_FORMAT.format(CacheKey.generate_hash(file.name))
-    if url := cache.get(cache_key):
-        return url
-    cache.set(cache_key, file.url, settings.MEDIA_FILE_CACHE_URL_TTL)
-    return file.url
-
-
 @strawberry.type
 class FileFieldType:
     @strawberry.field
@@ -61,11 +46,12 @@ class FileFieldType:
 
     @strawberry.field
     @staticmethod
+    @field_cost(FieldCost.DATALOADER)
     def url(root: DjFieldFile, info: Info) -> str:
-        return get_cached_file_uri(
-            root,
-            info.context.request,
-        )  # pyright: ignore [reportGeneralTypeIssues]
+        if isinstance(default_storage, FileSystemStorage):
+            return info.context.request.build_absolute_uri(root.url)
+        # Other is only S3 for now, batched using the request dataloader (Check load_file_urls)
+        return info.context.dl.common.load_file_urls.load(root.name)
 
 
 def file_field(field):
@@ -104,6 +90,7 @@ def user_field(field):
             return info.context.dl.user.load_users.load(_user_id)
 
     @strawberry.field
+    @field_cost(FieldCost.DATALOADER)
     def field_(root, info: Info) -> UserType:
         return _get_value(
             root,
@@ -111,6 +98,7 @@ def user_field(field):
         )   # pyright: ignore [reportGeneralTypeIssues]
 
     @strawberry.field
+    @field_cost(FieldCost.DATALOADER)
     def nullable_field_(root, info: Info) -> None | UserType:
         return _get_value(root, info)
 
@@ -1,21 +1,80 @@
 from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, transaction
 from django.utils.functional import cached_property
-from strawberry.dataloader import DataLoader
+
+from main.caches import CacheKey, TwoTierCache
+from utils.strawberry.dataloaders import InstrumentedDataLoader
 
 from .models import User
 from .types import UserType
 
+# Columns required by UserType
+USER_DISPLAY_FIELDS = ('id', 'first_name', 'last_name')
+
+
+class UserDisplayDataCache:
+    """
+    Cross-request cache for UserType data: Local LRU -> Redis
+    Only USER_DISPLAY_FIELDS are cached. Invalidated on save/delete (Check signals)
+    """
+    cache: TwoTierCache[int, dict] = TwoTierCache(
+        CacheKey.USER_DISPLAY_DATA_NAMESPACE,
+        timeout=settings.USER_DATALOADER_CACHE_TTL,
+        local_maxsize=settings.USER_DATALOADER_LOCAL_CACHE_MAXSIZE,
+        local_ttl=settings.USER_DATALOADER_LOCAL_CACHE_TTL,
+    )
+
+    @classmethod
+    def get_many(cls, user_ids: list[int]) -> dict[int, dict]:
+        return cls.cache.get_many(user_ids)
+
+    @classmethod
+    def set_many(cls, data: dict[int, dict]):
+        cls.cache.set_many(data)
+
+    @classmethod
+    def invalidate(cls, user_id: int):
+        # Invalidate again after commit, a request in between can cache the old data
+        cls.cache.delete(user_id)
+        transaction.on_commit(lambda: cls.cache.delete(user_id))
+
+
+def get_user_from_display_data(data: dict) -> User:
+    # Same as a instance fetched with .only(*USER_DISPLAY_FIELDS)
+    return User.from_db(
+        DEFAULT_DB_ALIAS,
+        USER_DISPLAY_FIELDS,
+        [data[field] for field in USER_DISPLAY_FIELDS],
+    )
+
 
-def load_users(keys: list[str]) -> list[list[UserType]]:
-    users_qs = User.objects.filter(id__in=keys)
-    _map = {
-        user.pk: user
-        for user in users_qs
-    }
+def load_users(keys: list[int]) -> list[list[UserType]]:
+    _map = {}
+    if settings.USER_DATALOADER_SHARED_CACHE:
+        _map = {
+            user_id: get_user_from_display_data(data)
+            for user_id, data in UserDisplayDataCache.get_many(keys).items()
+        }
+    if missing_keys := [key for key in keys if key not in _map]:
+        users_qs = User.objects.filter(id__in=missing_keys).only(*USER_DISPLAY_FIELDS)
+        fetched_users = {
+            user.pk: user
+            for user in users_qs
+        }
+        if settings.USER_DATALOADER_SHARED_CACHE:
+            UserDisplayDataCache.set_many({
+                user_id: {
+                    field: getattr(user, field)
+                    for field in USER_DISPLAY_FIELDS
+                }
+                for user_id, user in fetched_users.items()
+            })
+        _map.update(fetched_users)
     return [_map[key] for key in keys]
 
 
 class UserDataLoader():
     @cached_property
     def load_users(self) -> list[list[UserType]]:
-        return DataLoader(load_fn=sync_to_async(load_users))
+        return InstrumentedDataLoader(load_fn=sync_to_async(load_users))
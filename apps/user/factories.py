@@ -17,6 +17,13 @@ class UserFactory(DjangoModelFactory):
     class Meta:
         model = User
 
+    @classmethod
+    def _build(cls, model_class, *args, **kwargs):
+        password_text = kwargs.pop('password_text')
+        user = super()._build(model_class, *args, **kwargs)
+        user.password_text = password_text
+        return user
+
     @classmethod
     def _create(cls, model_class, *args, **kwargs):
         password_text = kwargs.pop('password_text')
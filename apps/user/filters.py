@@ -1,8 +1,11 @@
 import strawberry
 import strawberry_django
 from strawberry.types import Info
+from django.contrib.postgres.search import TrigramWordSimilarity
 from django.db import models
-from django.db.models.functions import Concat
+from django.db.models.functions import Greatest
+
+from utils.db import exclude_related
 
 from .models import User
 
@@ -11,31 +14,40 @@ from .models import User
 class UserFilter:
     id: strawberry.auto
     search: str | None
+    search_ranked: bool = False
     members_exclude_project: strawberry.ID | None
     exclude_me: bool = False
 
     def filter_search(self, queryset):
         value = self.search
         if value:
-            queryset = queryset.annotate(
-                full_name=Concat(
-                    models.F("first_name"),
-                    models.Value(" "),
-                    models.F("last_name"),
-                    output_field=models.CharField(),
-                )
+            # NOTE: first_name/last_name matches are included in full name matches
+            # Both predicates are backed by the trigram indexes (Check User.Meta.indexes)
+            queryset = queryset.alias(
+                search_full_name=User.get_full_name_expression(),
             ).filter(
-                models.Q(full_name__icontains=value) |
-                models.Q(first_name__icontains=value) |
-                models.Q(last_name__icontains=value) |
+                models.Q(search_full_name__icontains=value) |
                 models.Q(email__icontains=value)
             )
+            if self.search_ranked:
+                # NOTE: Used only if order is not provided
+                queryset = queryset.alias(
+                    search_rank=Greatest(
+                        TrigramWordSimilarity(value, User.get_full_name_expression()),
+                        TrigramWordSimilarity(value, 'email'),
+                    ),
+                ).order_by('-search_rank', 'id')
+        return queryset
+
+    def filter_search_ranked(self, queryset):
+        # Used by filter_search
         return queryset
 
     def filter_members_exclude_project(self, queryset):
         value = self.members_exclude_project
         if value:
-            queryset = queryset.exclude(projectmembership__project_id=value).distinct()
+            # NOTE: Requires a (project_id, member_id) index on ProjectMembership
+            queryset = exclude_related(queryset, 'projectmembership', project_id=value)
         return queryset
 
     def filter_exclude_me(self, queryset, info: Info):
@@ -2,7 +2,11 @@
 import typing
 from django.contrib.auth.models import AbstractUser
 from django.contrib.postgres.fields import ArrayField
+from django.contrib.postgres.indexes import GinIndex, OpClass
 from django.db import models
+from django.db.models.functions import Upper
+
+from utils.db import ImmutableConcat
 
 from .managers import CustomUserManager
 
@@ -54,6 +58,24 @@ class User(AbstractUser):
 
     pk: int
 
+    class Meta(AbstractUser.Meta):
+        indexes = [
+            # Trigram indexes for UserFilter.search (UPPER(...) LIKE UPPER(...) used by icontains)
+            GinIndex(
+                OpClass(Upper('email'), name='gin_trgm_ops'),
+                name='user_email_trgm_idx',
+            ),
+            GinIndex(
+                OpClass(Upper(ImmutableConcat('first_name', models.Value(' '), 'last_name')), name='gin_trgm_ops'),
+                name='user_full_name_trgm_idx',
+            ),
+        ]
+
+    @staticmethod
+    def get_full_name_expression():
+        # Same as the user_full_name_trgm_idx expression
+        return ImmutableConcat('first_name', models.Value(' '), 'last_name')
+
     def save(self, *args, **kwargs):
         # Make sure email/username are same and lowercase
         self.email = self.email.lower()
@@ -76,7 +98,7 @@ class User(AbstractUser):
         return True
 
     def get_global_permissions(self) -> set['GlobalPermission.Type']:
-        # Circular depencency
+        # Circular dependency
         from apps.common.models import GlobalPermission
 
         types = GlobalPermission.objects.filter(users=self).values_list('type', flat=True).distinct()
@@ -37,7 +37,7 @@ class PublicMutation:
     @strawberry.mutation
     @sync_to_async
     def register(self, data: RegisterInput, info: Info) -> MutationResponseType[UserMeType]:
-        serializer = RegisterSerializer(data=process_input_data(data), context={'request': info.context.request})
+        serializer = RegisterSerializer(data=process_input_data(data), context=info.context.get_serializer_context())
         if errors := mutation_is_not_valid(serializer):
             return MutationResponseType(
                 ok=False,
@@ -49,7 +49,7 @@ class PublicMutation:
     @strawberry.mutation
     @sync_to_async
     def login(self, data: LoginInput, info: Info) -> MutationResponseType[UserMeType]:
-        serializer = LoginSerializer(data=process_input_data(data), context={'request': info.context.request})
+        serializer = LoginSerializer(data=process_input_data(data), context=info.context.get_serializer_context())
         if errors := mutation_is_not_valid(serializer):
             return MutationResponseType(
                 ok=False,
@@ -72,7 +72,10 @@ class PublicMutation:
     @strawberry.mutation
     @sync_to_async
     def password_reset_trigger(self, data: PasswordResetTriggerInput, info: Info) -> MutationEmptyResponseType:
-        serializer = PasswordResetTriggerSerializer(data=process_input_data(data), context={'request': info.context.request})
+        serializer = PasswordResetTriggerSerializer(
+            data=process_input_data(data),
+            context=info.context.get_serializer_context(),
+        )
         if errors := mutation_is_not_valid(serializer):
             return MutationEmptyResponseType(
                 ok=False,
@@ -84,7 +87,10 @@ class PublicMutation:
     @strawberry.mutation
     @sync_to_async
     def password_reset_confirm(self, data: PasswordResetConfirmInput, info: Info) -> MutationEmptyResponseType:
-        serializer = PasswordResetConfirmSerializer(data=process_input_data(data), context={'request': info.context.request})
+        serializer = PasswordResetConfirmSerializer(
+            data=process_input_data(data),
+            context=info.context.get_serializer_context(),
+        )
         if errors := mutation_is_not_valid(serializer):
             return MutationEmptyResponseType(
                 ok=False,
@@ -100,7 +106,7 @@ class PrivateMutation:
     @strawberry.mutation
     @sync_to_async
     def change_user_password(self, data: PasswordChangeInput, info: Info) -> MutationEmptyResponseType:
-        serializer = PasswordChangeSerializer(data=process_input_data(data), context={'request': info.context.request})
+        serializer = PasswordChangeSerializer(data=process_input_data(data), context=info.context.get_serializer_context())
         if errors := mutation_is_not_valid(serializer):
             return MutationEmptyResponseType(
                 ok=False,
@@ -113,7 +119,12 @@ class PrivateMutation:
     @strawberry.mutation
     @sync_to_async
     def update_me(self, data: UserMeInput, info: Info) -> MutationResponseType[UserMeType]:
-        serializer = UserMeSerializer(data=process_input_data(data), context={'request': info.context.request}, partial=True)
+        serializer = UserMeSerializer(
+            instance=info.context.request.user,
+            data=process_input_data(data),
+            context=info.context.get_serializer_context(),
+            partial=True,
+        )
         if errors := mutation_is_not_valid(serializer):
             return MutationResponseType(
                 ok=False,
@@ -1,9 +1,13 @@
 import strawberry
-import strawberry_django
 from strawberry.types import Info
 
-from asgiref.sync import sync_to_async
-from utils.strawberry.paginations import CountList, pagination_field
+from utils.strawberry.fields import projected_field
+from utils.strawberry.paginations import (
+    CountList,
+    CursorList,
+    pagination_field,
+    cursor_pagination_field,
+)
 
 from .types import UserType, UserMeType, UserOrder
 from .filters import UserFilter
@@ -12,19 +16,24 @@ from .filters import UserFilter
 @strawberry.type
 class PublicQuery:
     @strawberry.field
-    @sync_to_async
-    def me(self, info: Info) -> UserMeType | None:
-        user = info.context.request.user
+    async def me(self, info: Info) -> UserMeType | None:
+        user = info.context.user
         if user.is_authenticated:
             return user
 
 
 @strawberry.type
 class PrivateQuery:
-    user: UserType = strawberry_django.field()
+    user: UserType = projected_field()
 
     users: CountList[UserType] = pagination_field(
         pagination=True,
         filters=UserFilter,
         order=UserOrder,
+        window_count=True,
+    )
+
+    users_cursor: CursorList[UserType] = cursor_pagination_field(
+        filters=UserFilter,
+        order=UserOrder,
     )
@@ -0,0 +1,16 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .dataloaders import UserDisplayDataCache, USER_DISPLAY_FIELDS
+from .models import User
+
+
+@receiver(post_save, sender=User)
+def user_saved(sender, instance, update_fields=None, **kwargs):
+    if update_fields is None or set(update_fields) & set(USER_DISPLAY_FIELDS):
+        UserDisplayDataCache.invalidate(instance.pk)
+
+
+@receiver(post_delete, sender=User)
+def user_deleted(sender, instance, **kwargs):
+    UserDisplayDataCache.invalidate(instance.pk)
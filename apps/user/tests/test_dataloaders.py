@@ -0,0 +1,46 @@
+from main.tests import TestCase
+
+from apps.user.dataloaders import load_users, UserDisplayDataCache
+from apps.user.factories import UserFactory
+
+
+class TestUserDataLoader(TestCase):
+    def test_load_users(self):
+        user1, user2 = UserFactory.create_batch(2)
+
+        # Fetched from the database
+        with self.assertNumQueries(1):
+            users = load_users([user2.pk, user1.pk])
+        assert [user.get_full_name() for user in users] == [user2.get_full_name(), user1.get_full_name()]
+
+        # Fetched from the local cache
+        with self.assertNumQueries(0):
+            users = load_users([user1.pk, user2.pk])
+        assert [user.pk for user in users] == [user1.pk, user2.pk]
+
+        # Fetched from redis
+        UserDisplayDataCache.cache.local_cache.clear()
+        with self.assertNumQueries(0):
+            users = load_users([user1.pk])
+        assert users[0].get_full_name() == user1.get_full_name()
+
+        # Invalidated on save (and after commit)
+        user1.first_name = 'Updated'
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            user1.save(update_fields=('first_name',))
+        assert len(callbacks) == 1
+        with self.assertNumQueries(1):
+            users = load_users([user1.pk, user2.pk])
+        assert users[0].first_name == 'Updated'
+
+        # Not invalidated when display fields are not changed
+        user2.save(update_fields=('password',))
+        with self.assertNumQueries(0):
+            load_users([user2.pk])
+
+        # Invalidated on delete
+        user2_id = user2.pk
+        assert user2_id in UserDisplayDataCache.get_many([user2_id])
+        with self.captureOnCommitCallbacks(execute=True):
+            user2.delete()
+        assert UserDisplayDataCache.get_many([user2_id]) == {}
@@ -335,3 +335,8 @@ class TestUserMutation(TestCase):
         content = self.query_check(mutation, variables=variables)
         assert content['data']['private']['updateMe']['ok'] is True, content
         assert content['data']['private']['updateMe']['errors'] is None, content
+        # Current user is updated (No new user is created)
+        user.refresh_from_db()
+        assert user.first_name == 'Admin'
+        assert user.email_opt_outs == [User.OptEmailNotificationType.NEWS_AND_OFFERS]
+        assert User.objects.count() == 1
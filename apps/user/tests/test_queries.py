@@ -1,6 +1,14 @@
+from unittest import mock
+
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
 from main.tests import TestCase
+from utils.strawberry.paginations import get_cached_count, get_count_cache, register_count_invalidation
 
 from apps.user.models import User
+from apps.common.models import GlobalPermission, GlobalPermissionCache
 
 from apps.user.factories import UserFactory
 from apps.project.factories import ProjectFactory
@@ -62,7 +70,8 @@ class TestUserQuery(TestCase):
         user = self.user
         # With authentication -----
         self.force_login(user)
-        content = self.query_check(self.Query.ME)
+        # Session, user and global permissions
+        content = self.query_check(self.Query.ME, max_queries=3)
         assert content['data']['public']['me'] == dict(
             id=self.gID(user.id),
             email=user.email,
@@ -75,6 +84,43 @@ class TestUserQuery(TestCase):
             ],
         )
 
+    def test_me_global_permissions(self):
+        query = '''
+            query meQuery {
+              public {
+                me {
+                  globalPermissions
+                }
+              }
+            }
+        '''
+
+        def _query_global_permissions():
+            content = self.query_check(query)
+            return set(content['data']['public']['me']['globalPermissions'])
+
+        user = self.user
+        upload_permission = self.global_permissions[GlobalPermission.Type.UPLOAD_QBANK]
+        activate_permission = self.global_permissions[GlobalPermission.Type.ACTIVATE_QBANK]
+        self.force_login(user)
+        assert _query_global_permissions() == set()
+        # Cached permissions
+        with self.assertNumQueries(0):
+            GlobalPermissionCache.get(user)
+
+        # Changes are reflected immediately
+        upload_permission.add_user(user)
+        assert _query_global_permissions() == {self.genum(GlobalPermission.Type.UPLOAD_QBANK)}
+        user.globalpermission_set.add(activate_permission)
+        assert _query_global_permissions() == {
+            self.genum(GlobalPermission.Type.UPLOAD_QBANK),
+            self.genum(GlobalPermission.Type.ACTIVATE_QBANK),
+        }
+        upload_permission.users.remove(user)
+        assert _query_global_permissions() == {self.genum(GlobalPermission.Type.ACTIVATE_QBANK)}
+        activate_permission.users.clear()
+        assert _query_global_permissions() == set()
+
     def test_users(self):
         user1, user2, user3 = self.users
         project = ProjectFactory.create(created_by=user1, modified_by=user1)
@@ -90,6 +136,8 @@ class TestUserQuery(TestCase):
             ({'id': {'exact': self.gID(user1.id)}}, [user1]),
             # Free text search tests
             ({'search': 'hero'}, [user1, user3]),
+            ({'search': 'st he'}, [user1, user3]),
+            ({'search': 'example villain'}, [user2]),
             ({'search': 'test'}, [user1, user3]),
             ({'search': '@vil'}, [user2]),
             ({'search': 'sample'}, [user1, user2]),
@@ -98,7 +146,12 @@ class TestUserQuery(TestCase):
             ({}, [self.user, *self.users]),
             ({'excludeMe': True}, self.users),
         ]:
-            content = self.query_check(self.Query.USERS, variables={'filters': filters})
+            # Session, user, global permissions (cached after the first request) and the page with the window count
+            content = self.query_check(
+                self.Query.USERS,
+                variables={'filters': filters},
+                max_queries=4,
+            )
             assert content['data']['private']['users'] == {
                 'count': len(expected_users),
                 'limit': 10,
@@ -113,3 +166,144 @@ class TestUserQuery(TestCase):
                     for user in expected_users
                 ]
             }, (filters, expected_users)
+
+    def test_users_search_ranked(self):
+        query = '''
+            query MyQuery($filters: UserFilter) {
+              private {
+                users(pagination: {limit: 10, offset: 0}, filters: $filters) {
+                  items {
+                    id
+                  }
+                }
+              }
+            }
+        '''
+        user1, user2, user3 = self.users
+        user4 = UserFactory.create(first_name='Heroine', last_name='Tester')
+        self.force_login(self.user)
+        content = self.query_check(query, variables={'filters': {'search': 'hero', 'searchRanked': True}})
+        assert [
+            item['id']
+            for item in content['data']['private']['users']['items']
+        ] == [self.gID(user.id) for user in [user1, user3, user4]]
+
+    def test_users_pagination(self):
+        query = '''
+            query MyQuery($pagination: OffsetPaginationInput) {
+              private {
+                users(order: {id: ASC}, pagination: $pagination) {
+                  limit
+                  offset
+                  count
+                  items {
+                    id
+                  }
+                }
+              }
+            }
+        '''
+        all_users = [self.user, *self.users]
+        self.force_login(self.user)
+        for pagination, expected_users in [
+            ({'limit': 2, 'offset': 0}, all_users[:2]),
+            ({'limit': 2, 'offset': 3}, all_users[3:]),
+            # Offset beyond the last row (count is still provided)
+            ({'limit': 2, 'offset': 10}, []),
+        ]:
+            content = self.query_check(query, variables={'pagination': pagination})
+            assert content['data']['private']['users'] == {
+                'count': len(all_users),
+                'limit': pagination['limit'],
+                'offset': pagination['offset'],
+                'items': [
+                    {'id': self.gID(user.id)}
+                    for user in expected_users
+                ],
+            }, pagination
+
+    def test_users_cursor(self):
+        query = '''
+            query MyQuery($order: UserOrder, $pagination: CursorPaginationInput) {
+              private {
+                usersCursor(order: $order, pagination: $pagination) {
+                  limit
+                  hasNext
+                  nextCursor
+                  items {
+                    id
+                  }
+                }
+              }
+            }
+        '''
+        all_users = [self.user, *self.users]
+        self.force_login(self.user)
+        for order, expected_users in [
+            ({'id': 'ASC'}, all_users),
+            ({'id': 'DESC'}, all_users[::-1]),
+        ]:
+            fetched_users_id = []
+            pagination = {'limit': 3}
+            while True:
+                content = self.query_check(query, variables={'order': order, 'pagination': pagination})
+                users_cursor = content['data']['private']['usersCursor']
+                assert users_cursor['limit'] == 3
+                fetched_users_id.extend([item['id'] for item in users_cursor['items']])
+                if not users_cursor['hasNext']:
+                    assert users_cursor['nextCursor'] is None
+                    break
+                pagination['after'] = users_cursor['nextCursor']
+            assert fetched_users_id == [self.gID(user.id) for user in expected_users], order
+
+        # Invalid cursor
+        content = self.query_check(
+            query,
+            variables={
+                'order': {'id': 'ASC'},
+                'pagination': {'limit': 1, 'after': 'invalid-cursor'},
+            },
+            assert_errors=True,
+        )
+
+    def test_users_cached_count(self):
+        # Not registered
+        with self.assertRaises(AssertionError):
+            get_cached_count(GlobalPermission.objects.all())
+
+        register_count_invalidation(User)
+        users_qs = User.objects.filter(first_name='Test')
+        assert get_cached_count(users_qs) == 2
+        # Cached value is used
+        with self.assertNumQueries(0):
+            assert get_cached_count(users_qs) == 2
+        # Invalidated on save
+        UserFactory.create(first_name='Test')
+        assert get_cached_count(users_qs) == 3
+        # Invalidated on delete
+        users_qs.first().delete()
+        assert get_cached_count(users_qs) == 2
+
+        # Counted by other process: Not waiting for it (Blocks the sync_to_async thread)
+        count_cache = get_count_cache(User)
+        count_cache.invalidate()
+        sql, params = users_qs.query.sql_with_params()
+        cache.add(f"{count_cache.make_key(f'{sql}-{params}', count_cache.get_version())}-lock", 1, 10)
+        with mock.patch('main.caches.time.sleep') as sleep_mock:
+            assert get_cached_count(users_qs) == 2
+        sleep_mock.assert_not_called()
+
+    def test_users_only_required_columns(self):
+        self.force_login(self.user)
+        with CaptureQueriesContext(connection) as context:
+            self.query_check(self.Query.USERS)
+        users_queries = [
+            query['sql']
+            for query in context.captured_queries
+            if 'LIMIT 10' in query['sql']
+        ]
+        assert len(users_queries) == 1, users_queries
+        # Only the columns used by the selected fields are fetched
+        assert '"first_name"' in users_queries[0]
+        assert '"password"' not in users_queries[0]
+        assert '"email_opt_outs"' not in users_queries[0]
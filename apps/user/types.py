@@ -3,6 +3,7 @@ import strawberry_django
 from strawberry.types import Info
 
 from utils.strawberry.enums import enum_field, enum_display_field
+from utils.strawberry.fields import requires_fields
 
 from apps.common.enums import GlobalPermissionTypeEnum
 from .models import User
@@ -20,6 +21,7 @@ class UserType:
     last_name: strawberry.auto
 
     @strawberry.field
+    @requires_fields('first_name', 'last_name')
     def display_name(self) -> str:
         return self.get_full_name()
 
@@ -31,5 +33,6 @@ class UserMeType(UserType):
     email_opt_outs_display = enum_display_field(User.email_opt_outs)
 
     @strawberry.field
+    @requires_fields()
     def global_permissions(self, info: Info) -> list[GlobalPermissionTypeEnum]:
         return info.context.global_permissions
@@ -0,0 +1,91 @@
+"""
+GraphQL benchmark for the public/private endpoints
+
+Seeds a temporary test database and drives the operations through the ASGI app (in-process) concurrently.
+Reports p50/p99 latency, throughput, SQL queries per operation and allocations.
+
+Usage:
+    python -m benchmarks --users 1000 --requests 200 --concurrency 10
+    python -m benchmarks --compare benchmarks/results/<other-commit>.json
+"""
+import argparse
+import asyncio
+import dataclasses
+import json
+import os
+import subprocess
+
+import django
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'main.settings')
+django.setup()
+
+from django.db import connection  # noqa: E402
+from django.test.utils import override_settings, setup_test_environment, teardown_test_environment  # noqa: E402
+
+from main.tests.base import TEST_CACHES  # noqa: E402
+
+from .operations import get_operations  # noqa: E402
+from .runner import PASSWORD, compare, dump, run, seed, summary  # noqa: E402
+
+
+def get_commit() -> str:
+    try:
+        return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'], text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+
+def main():
+    parser = argparse.ArgumentParser(description='GraphQL benchmark')
+    parser.add_argument('--users', type=int, default=1000, help='Number of users to seed')
+    parser.add_argument('--requests', type=int, default=200, help='Requests per operation')
+    parser.add_argument('--concurrency', type=int, default=10)
+    parser.add_argument('--operations', nargs='*', help='Operation names (Default: all)')
+    parser.add_argument('--output', help='JSON file (Default: benchmarks/results/<commit>.json)')
+    parser.add_argument('--compare', help='Previous JSON result to compare with')
+    parser.add_argument('--keepdb', action='store_true', help='Reuse the test database')
+    args = parser.parse_args()
+
+    commit = get_commit()
+    setup_test_environment()
+    old_db_name = connection.settings_dict['NAME']
+    connection.creation.create_test_db(verbosity=0, keepdb=args.keepdb)
+    try:
+        with override_settings(DEBUG=False, CACHES=TEST_CACHES):
+            from django.core.cache import cache
+            cache.clear()
+            user = seed(args.users)
+            operations = [
+                operation
+                for operation in get_operations(args.users, user.email, PASSWORD)
+                if not args.operations or operation.name in args.operations
+            ]
+            results = asyncio.run(run(operations, user, args.requests, args.concurrency))
+    finally:
+        connection.creation.destroy_test_db(old_db_name, verbosity=0, keepdb=args.keepdb)
+        teardown_test_environment()
+
+    data = dict(
+        commit=commit,
+        users=args.users,
+        requests=args.requests,
+        concurrency=args.concurrency,
+        operations=[dataclasses.asdict(result) for result in results],
+    )
+    for result in results:
+        print(summary(result))
+
+    output = args.output or os.path.join(os.path.dirname(__file__), 'results', f'{commit}.json')
+    os.makedirs(os.path.dirname(output), exist_ok=True)
+    dump(data, output)
+    print(f'Results saved to {output}')
+
+    if args.compare:
+        with open(args.compare) as fp:
+            for line in compare(data, json.load(fp)):
+                print(line)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,71 @@
+"""
+Micro-benchmark for the cache key hashing (Check CacheKey.generate_hash)
+
+Compares md5 (previous), blake2b (CacheKey.generate_hash), xxhash (if installed, not a dependency)
+and the memoized file name hash using file names (repeated, as in FileFieldType.url)
+and SQL sized keys (as in the pagination count cache).
+
+Usage:
+    python -m benchmarks.hashing --number 100000
+"""
+import argparse
+import hashlib
+import os
+import timeit
+import uuid
+
+import django
+
+try:
+    import xxhash
+except ImportError:  # Only for the comparison
+    xxhash = None
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'main.settings')
+django.setup()
+
+from main.caches import CacheKey  # noqa: E402
+from apps.common.dataloaders import generate_file_name_hash  # noqa: E402
+
+
+def get_hash_functions(input_name: str) -> dict:
+    functions = {
+        'md5': lambda string: hashlib.md5(string.encode()).hexdigest(),
+        'CacheKey.generate_hash': CacheKey.generate_hash,
+    }
+    if xxhash is not None:
+        functions['xxh3-128'] = lambda string: xxhash.xxh3_128_hexdigest(string.encode())
+    if input_name == 'file-name':
+        # Memoized only for the file names (Check FileUrlCache)
+        functions['generate_file_name_hash'] = generate_file_name_hash
+    return functions
+
+
+def get_inputs(unique: int) -> dict[str, list[str]]:
+    file_names = [f'media/user/avatar/{uuid.uuid4()}.png' for _ in range(unique)]
+    sql = 'SELECT "user_user"."id" FROM "user_user" WHERE "user_user"."is_active" ORDER BY "user_user"."id" ASC'
+    return {
+        'file-name': file_names,
+        'sql': [f'{sql} -- {index}' * 5 for index in range(unique)],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Cache key hashing benchmark')
+    parser.add_argument('--number', type=int, default=100000, help='Hashes per function and input')
+    parser.add_argument('--unique', type=int, default=1000, help='Unique keys (Repeated to fill --number)')
+    args = parser.parse_args()
+
+    if xxhash is None:
+        print('xxhash is not installed, skipping xxh3-128')
+    for input_name, keys in get_inputs(args.unique).items():
+        keys = (keys * (args.number // len(keys) + 1))[:args.number]
+        print(f'{input_name} (avg length: {sum(len(key) for key in keys) / len(keys):.0f})')
+        for name, func in get_hash_functions(input_name).items():
+            generate_file_name_hash.cache_clear()
+            seconds = timeit.timeit(lambda: [func(key) for key in keys], number=1)
+            print(f'  {name:<24} {seconds / args.number * 1e9:>8.0f} ns/hash')
+
+
+if __name__ == '__main__':
+    main()
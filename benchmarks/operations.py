@@ -0,0 +1,112 @@
+import dataclasses
+import typing
+
+
+@dataclasses.dataclass
+class Operation:
+    name: str
+    query: str
+    # Returns the variables for the n-th request
+    get_variables: typing.Callable[[int], dict] = lambda _: {}
+    authenticated: bool = True
+
+
+ME = '''
+    query Me {
+      public {
+        me {
+          id
+          email
+          firstName
+          lastName
+          displayName
+          emailOptOuts
+          globalPermissions
+        }
+      }
+    }
+'''
+
+USERS = '''
+    query Users($filters: UserFilter, $order: UserOrder, $pagination: OffsetPaginationInput) {
+      private {
+        users(filters: $filters, order: $order, pagination: $pagination) {
+          count
+          items {
+            id
+            firstName
+            lastName
+            displayName
+          }
+        }
+      }
+    }
+'''
+
+LOGIN = '''
+    mutation Login($data: LoginInput!) {
+      public {
+        login(data: $data) {
+          ok
+          errors
+        }
+      }
+    }
+'''
+
+UPDATE_ME = '''
+    mutation UpdateMe($data: UserMeInput!) {
+      private {
+        updateMe(data: $data) {
+          ok
+          errors
+        }
+      }
+    }
+'''
+
+
+def get_operations(users_count: int, login_email: str, login_password: str) -> list[Operation]:
+    return [
+        Operation('me', ME),
+        Operation(
+            'users',
+            USERS,
+            lambda _: dict(
+                order={'id': 'ASC'},
+                pagination={'limit': 10, 'offset': 0},
+            ),
+        ),
+        Operation(
+            'users-filtered',
+            USERS,
+            lambda n: dict(
+                filters={'search': ['an', 'er', 'son', 'xyz'][n % 4]},
+                order={'id': 'DESC'},
+                pagination={'limit': 10, 'offset': 0},
+            ),
+        ),
+        Operation(
+            'users-deep-offset',
+            USERS,
+            lambda _: dict(
+                order={'id': 'ASC'},
+                pagination={'limit': 10, 'offset': max(users_count - 20, 0)},
+            ),
+        ),
+        Operation(
+            'login',
+            LOGIN,
+            lambda _: dict(
+                data={'email': login_email, 'password': login_password},
+            ),
+            authenticated=False,
+        ),
+        Operation(
+            'updateMe',
+            UPDATE_ME,
+            lambda n: dict(
+                data={'firstName': f'Benchmark {n}'},
+            ),
+        ),
+    ]
@@ -0,0 +1,211 @@
+import asyncio
+import dataclasses
+import json
+import threading
+import time
+import tracemalloc
+
+from asgiref.sync import sync_to_async
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.test import AsyncClient, override_settings
+
+from apps.user.models import User
+from apps.user.factories import UserFactory
+from apps.common.models import GlobalPermission
+from apps.common.factories import GlobalPermissionFactory
+
+from .operations import Operation
+
+GRAPHQL_PATH = '/graphql/'
+PASSWORD = 'benchmark-password'
+
+
+class SQLCounter:
+    """
+    Count SQL queries from all the connections (Sync resolvers run the queries in the executor threads)
+    """
+
+    def __init__(self):
+        self.queries = 0
+        self.time = 0.0
+        self._lock = threading.Lock()
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            with self._lock:
+                self.queries += 1
+                self.time += time.perf_counter() - start
+
+    def install(self, connection, **_):
+        connection.execute_wrappers.append(self)
+
+    def reset(self):
+        with self._lock:
+            self.queries = 0
+            self.time = 0.0
+
+
+@dataclasses.dataclass
+class OperationResult:
+    name: str
+    requests: int
+    errors: int
+    p50_ms: float
+    p99_ms: float
+    throughput: float
+    sql_queries: int
+    sql_time_ms: float
+    allocated_kib: float
+    peak_kib: float
+
+
+def seed(users_count: int) -> User:
+    # Fast hasher for the seeded users, login is measured using the real hasher
+    with override_settings(PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher']):
+        users = User.objects.bulk_create(UserFactory.build_batch(users_count))
+    user = UserFactory.create(password_text=PASSWORD)
+    for _type in GlobalPermission.Type:
+        permission = GlobalPermissionFactory.create(type=_type)
+        permission.users.add(user, *users[::10])
+    return user
+
+
+def percentile(values: list[float], percent: float) -> float:
+    values = sorted(values)
+    index = min(int(round(percent / 100 * (len(values) - 1))), len(values) - 1)
+    return values[index]
+
+
+async def _request(client: AsyncClient, operation: Operation, n: int) -> tuple[float, bool]:
+    start = time.perf_counter()
+    response = await client.post(
+        GRAPHQL_PATH,
+        data={
+            'query': operation.query,
+            'variables': operation.get_variables(n),
+        },
+        content_type='application/json',
+    )
+    duration = time.perf_counter() - start
+    content = response.json()
+    return duration, response.status_code != 200 or bool(content.get('errors'))
+
+
+async def get_client(operation: Operation, user: User) -> AsyncClient:
+    client = AsyncClient()
+    if operation.authenticated:
+        # NOTE: force_login is sync only (Session is saved using the database)
+        await sync_to_async(client.force_login)(user)
+    return client
+
+
+async def profile_operation(operation: Operation, user: User, sql_counter: SQLCounter) -> dict:
+    """
+    Single (warm) request: SQL queries and allocations
+    """
+    client = await get_client(operation, user)
+    await _request(client, operation, 0)
+    sql_counter.reset()
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    allocated, _ = tracemalloc.get_traced_memory()
+    await _request(client, operation, 1)
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return dict(
+        sql_queries=sql_counter.queries,
+        sql_time_ms=sql_counter.time * 1000,
+        allocated_kib=(current - allocated) / 1024,
+        peak_kib=(peak - allocated) / 1024,
+    )
+
+
+async def run_operation(
+    operation: Operation,
+    user: User,
+    requests: int,
+    concurrency: int,
+    sql_counter: SQLCounter,
+) -> OperationResult:
+    profile = await profile_operation(operation, user, sql_counter)
+
+    clients = [await get_client(operation, user) for _ in range(concurrency)]
+    durations = []
+    errors = 0
+
+    async def _worker(index: int):
+        nonlocal errors
+        for n in range(index, requests, concurrency):
+            duration, has_errors = await _request(clients[index], operation, n)
+            durations.append(duration)
+            errors += has_errors
+
+    start = time.perf_counter()
+    await asyncio.gather(*[_worker(index) for index in range(concurrency)])
+    total_time = time.perf_counter() - start
+
+    return OperationResult(
+        name=operation.name,
+        requests=requests,
+        errors=errors,
+        p50_ms=percentile(durations, 50) * 1000,
+        p99_ms=percentile(durations, 99) * 1000,
+        throughput=requests / total_time,
+        **profile,
+    )
+
+
+async def run(
+    operations: list[Operation],
+    user: User,
+    requests: int,
+    concurrency: int,
+) -> list[OperationResult]:
+    sql_counter = SQLCounter()
+    connection_created.connect(sql_counter.install)
+    try:
+        return [
+            await run_operation(operation, user, requests, concurrency, sql_counter)
+            for operation in operations
+        ]
+    finally:
+        connection_created.disconnect(sql_counter.install)
+        # Connections opened by the sync resolvers (executor thread), the test database is dropped afterwards
+        await sync_to_async(connections.close_all)()
+
+
+def compare(results: dict, baseline: dict) -> list[str]:
+    baseline_operations = {
+        operation['name']: operation
+        for operation in baseline['operations']
+    }
+    lines = []
+    for operation in results['operations']:
+        if (base := baseline_operations.get(operation['name'])) is None:
+            continue
+        lines.append(
+            f"{operation['name']}: "
+            + ', '.join([
+                f"{key} {base[key]:.2f} -> {operation[key]:.2f}"
+                f" ({(operation[key] - base[key]) / (base[key] or 1) * 100:+.1f}%)"
+                for key in ['p50_ms', 'p99_ms', 'throughput', 'sql_queries', 'peak_kib']
+            ])
+        )
+    return lines
+
+
+def dump(results: dict, path: str):
+    with open(path, 'w') as fp:
+        json.dump(results, fp, indent=2)
+
+
+def summary(result: OperationResult) -> str:
+    return (
+        f'{result.name:<20} p50 {result.p50_ms:8.2f}ms p99 {result.p99_ms:8.2f}ms'
+        f' {result.throughput:8.1f} req/s sql {result.sql_queries:3} ({result.sql_time_ms:.2f}ms)'
+        f' alloc {result.allocated_kib:.1f}KiB peak {result.peak_kib:.1f}KiB errors {result.errors}'
+    )
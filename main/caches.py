@@ -1,21 +1,303 @@
+import dataclasses
 import hashlib
+import threading
+import time
+import typing
+from collections import OrderedDict
 
-from django.core.cache import caches
+from django.core.cache import cache, caches
+from django.core.cache.backends.base import DEFAULT_TIMEOUT
 
 local_cache = caches['local-memory']
 
+KT = typing.TypeVar('KT', bound=typing.Hashable)
+VT = typing.TypeVar('VT')
+
+# Prefix of the hashes (Check CacheKey.generate_hash)
+HASH_ALGORITHM = 'b2'
+
+
+class LocalTTLCache:
+    """
+    Bounded in-process LRU cache with TTL.
+    NOTE: This is per process, use a small TTL for values which can be changed by other processes.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: OrderedDict[typing.Hashable, tuple[float, typing.Any]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_many(self, keys: typing.Iterable[typing.Hashable]) -> dict:
+        now = time.monotonic()
+        values = {}
+        with self._lock:
+            for key in keys:
+                if (item := self._data.get(key)) is None:
+                    continue
+                expire_at, value = item
+                if expire_at < now:
+                    del self._data[key]
+                    continue
+                self._data.move_to_end(key)
+                values[key] = value
+        return values
+
+    def get(self, key: typing.Hashable, default=None):
+        return self.get_many([key]).get(key, default)
+
+    def set_many(self, data: dict):
+        expire_at = time.monotonic() + self.ttl
+        with self._lock:
+            for key, value in data.items():
+                self._data[key] = (expire_at, value)
+                self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def set(self, key: typing.Hashable, value):
+        self.set_many({key: value})
+
+    def delete(self, key: typing.Hashable):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+@dataclasses.dataclass
+class CacheStats:
+    local_hits: int = 0
+    hits: int = 0
+    misses: int = 0
+
+    @property
+    def hit_ratio(self) -> float:
+        total = self.local_hits + self.hits + self.misses
+        if total == 0:
+            return 0
+        return (self.local_hits + self.hits) / total
+
+    def as_dict(self) -> dict:
+        return {
+            **dataclasses.asdict(self),
+            'hit_ratio': self.hit_ratio,
+        }
+
+
+class TwoTierCache(typing.Generic[KT, VT]):
+    """
+    Namespaced cache: Local LRU (Optional, using local_maxsize) -> Redis
+    - Redis keys: {namespace}-{key} or {namespace}-{version}-{key} for the versioned namespaces
+    - Tuple keys are joined using "-", use hash_keys for the long keys (eg: SQL)
+      hash_function (Default: CacheKey.generate_hash) can be memoized for the repeated short keys (eg: file names)
+    - Versioned namespaces are invalidated in bulk using invalidate (The old entries are dropped by the TTL)
+    - single_flight (get_or_set): only one process computes a missing value, others wait for it (up to lock_timeout)
+      NOTE: The wait blocks the thread (sync_to_async thread is shared), only use it for the expensive values
+    NOTE: None is not cached. Local entries are not invalidated by other processes, use a small local_ttl
+    Usage:
+        user_cache: TwoTierCache[int, dict] = TwoTierCache('user', timeout=60, local_maxsize=100, local_ttl=10)
+        user_cache.get_many([1, 2])
+    """
+    LOCK_POLL_INTERVAL = 0.05
+
+    # Used for the metrics
+    namespaces: dict[str, 'TwoTierCache'] = {}
+
+    def __init__(
+        self,
+        namespace: str,
+        timeout: int | None | object = DEFAULT_TIMEOUT,
+        local_maxsize: int = 0,
+        local_ttl: float = 0,
+        versioned: bool = False,
+        hash_keys: bool = False,
+        hash_function: typing.Callable[[str], str] | None = None,
+        single_flight: bool = False,
+        lock_timeout: int = 1,
+    ):
+        assert namespace not in TwoTierCache.namespaces, f'{namespace} is already registered'
+        self.namespace = namespace
+        self.timeout = timeout
+        self.local_ttl = local_ttl
+        self.local_cache = LocalTTLCache(maxsize=local_maxsize, ttl=local_ttl) if local_maxsize else None
+        self.versioned = versioned
+        self.hash_keys = hash_keys
+        self.hash_function = hash_function or CacheKey.generate_hash
+        self.single_flight = single_flight
+        self.lock_timeout = lock_timeout
+        self.stats = CacheStats()
+        # (expire_at, version), the version is cached locally for local_ttl
+        self._version: tuple[float, typing.Any] | None = None
+        TwoTierCache.namespaces[namespace] = self
+
+    @classmethod
+    def get_stats(cls) -> dict[str, CacheStats]:
+        return {
+            namespace: namespace_cache.stats
+            for namespace, namespace_cache in cls.namespaces.items()
+        }
+
+    @classmethod
+    def clear_all_local(cls):
+        for namespace_cache in cls.namespaces.values():
+            namespace_cache.clear_local()
+
+    def get_version_cache_key(self) -> str:
+        return f'{self.namespace}-version'
+
+    def get_version(self):
+        if self._version is not None and self._version[0] > time.monotonic():
+            return self._version[1]
+        version_key = self.get_version_cache_key()
+        if (version := cache.get(version_key)) is None:
+            # NOTE: Not using a counter, a evicted version should not match the old entries
+            cache.add(version_key, time.time_ns(), None)
+            version = cache.get(version_key)
+        self._version = (time.monotonic() + self.local_ttl, version)
+        return version
+
+    def invalidate(self):
+        assert self.versioned, f'{self.namespace} is not versioned'
+        cache.set(self.get_version_cache_key(), time.time_ns(), None)
+        self._version = None
+        if self.local_cache is not None:
+            self.local_cache.clear()
+
+    def make_key(self, key: KT, version=None) -> str:
+        if isinstance(key, tuple):
+            key = '-'.join(str(_key) for _key in key)
+        else:
+            key = str(key)
+        if self.hash_keys:
+            key = self.hash_function(key)
+        if self.versioned:
+            return f'{self.namespace}-{version}-{key}'
+        return f'{self.namespace}-{key}'
+
+    def _make_keys(self, keys: typing.Iterable[KT]) -> dict[str, KT]:
+        version = self.get_version() if self.versioned else None
+        return {
+            self.make_key(key, version): key
+            for key in keys
+        }
+
+    def _get_many(self, cache_keys: dict[str, KT]) -> dict[KT, VT]:
+        data = {}
+        if self.local_cache is not None:
+            data = self.local_cache.get_many(cache_keys.keys())
+            self.stats.local_hits += len(data)
+        if missing_keys := [
+            cache_key
+            for cache_key in cache_keys
+            if cache_key not in data
+        ]:
+            redis_data = cache.get_many(missing_keys)
+            self.stats.hits += len(redis_data)
+            self.stats.misses += len(missing_keys) - len(redis_data)
+            if self.local_cache is not None:
+                self.local_cache.set_many(redis_data)
+            data.update(redis_data)
+        return {
+            cache_keys[cache_key]: value
+            for cache_key, value in data.items()
+        }
+
+    def _set_many(self, cache_data: dict[str, VT], timeout):
+        if self.local_cache is not None:
+            self.local_cache.set_many(cache_data)
+        cache.set_many(cache_data, self.timeout if timeout is DEFAULT_TIMEOUT else timeout)
+
+    def get_many(self, keys: typing.Iterable[KT]) -> dict[KT, VT]:
+        return self._get_many(self._make_keys(keys))
+
+    def get(self, key: KT, default: VT | None = None) -> VT | None:
+        return self.get_many([key]).get(key, default)
+
+    def set_many(self, data: dict[KT, VT], timeout: int | None | object = DEFAULT_TIMEOUT):
+        self._set_many(
+            {
+                cache_key: data[key]
+                for cache_key, key in self._make_keys(data.keys()).items()
+            },
+            timeout,
+        )
+
+    def set(self, key: KT, value: VT, timeout: int | None | object = DEFAULT_TIMEOUT):
+        self.set_many({key: value}, timeout=timeout)
+
+    def delete_many(self, keys: typing.Iterable[KT]):
+        cache_keys = list(self._make_keys(keys))
+        if self.local_cache is not None:
+            for cache_key in cache_keys:
+                self.local_cache.delete(cache_key)
+        cache.delete_many(cache_keys)
+
+    def delete(self, key: KT):
+        self.delete_many([key])
+
+    def get_or_set(self, key: KT, default: typing.Callable[[], VT], timeout: int | None | object = DEFAULT_TIMEOUT) -> VT:
+        cache_keys = self._make_keys([key])
+        if (value := self._get_many(cache_keys).get(key)) is not None:
+            return value
+        cache_key = next(iter(cache_keys))
+        if not self.single_flight:
+            value = default()
+            self._set_many({cache_key: value}, timeout)
+            return value
+        lock_key = f'{cache_key}-lock'
+        if cache.add(lock_key, 1, self.lock_timeout):
+            try:
+                value = default()
+                self._set_many({cache_key: value}, timeout)
+            finally:
+                cache.delete(lock_key)
+            return value
+        # Other process is computing the value, wait for it
+        wait_until = time.monotonic() + self.lock_timeout
+        while time.monotonic() < wait_until:
+            time.sleep(self.LOCK_POLL_INTERVAL)
+            if (value := cache.get(cache_key)) is not None:
+                return value
+        # Not computed within lock_timeout (Slow or failed), compute without the lock
+        value = default()
+        self._set_many({cache_key: value}, timeout)
+        return value
+
+    def clear_local(self):
+        if self.local_cache is not None:
+            self.local_cache.clear()
+        self._version = None
+        self.stats = CacheStats()
+
 
 class CacheKey:
     # Redis Cache
-    URL_CACHED_FILE_FIELD_KEY_FORMAT = 'url-cached-file-key-{0}'
+    URL_CACHED_FILE_FIELD_REFRESH_LOCK_KEY_FORMAT = 'url-cached-file-refresh-lock-{0}'
+    GLOBAL_PERMISSION_VERSION_KEY_FORMAT = 'global-permission-version-{0}'
+    GRAPHQL_PERSISTED_QUERY_KEY_FORMAT = 'graphql-persisted-query-{0}'
+    GRAPHQL_APQ_KEY_FORMAT = 'graphql-apq-{0}'
+    GRAPHQL_USER_COST_BUDGET_KEY_FORMAT = 'graphql-user-cost-budget-{0}'
+    GRAPHQL_RESPONSE_CACHE_TAG_VERSION_KEY_FORMAT = 'graphql-response-cache-tag-version-{0}'
 
-    # Local (RAM) Cache
-    TEMP_CLIENT_ID_KEY_FORMAT = 'client-id-mixin-{request_hash}-{instance_type}-{instance_id}'
+    # Namespaces (Check TwoTierCache)
+    URL_CACHED_FILE_FIELD_NAMESPACE = 'url-cached-file-with-expiry'
+    PAGINATION_COUNT_NAMESPACE_FORMAT = 'pagination-count-{model}'
+    USER_DISPLAY_DATA_NAMESPACE = 'user-display-data'
+    GLOBAL_PERMISSION_NAMESPACE = 'global-permission'
+    GRAPHQL_RESPONSE_CACHE_NAMESPACE = 'graphql-response-cache'
 
+    # Local (RAM) Cache
     EXPORT_TASK_ID_CACHE_KEY = 'export-task-async-id-%s'
 
     @staticmethod
-    def generate_hash(string: str):
-        hash_md5 = hashlib.md5()
-        hash_md5.update(string.encode())
-        return hash_md5.hexdigest()
+    def generate_hash(string: str) -> str:
+        """
+        128 bits blake2b hash for the cache keys (Same across the processes)
+        NOTE: Prefixed with the algorithm, keys using the previous hash (md5) are not read anymore
+        and expire using their TTL
+        """
+        return f'{HASH_ALGORITHM}-{hashlib.blake2b(string.encode(), digest_size=16).hexdigest()}'
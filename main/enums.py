@@ -1,6 +1,9 @@
+import json
 import strawberry
 import dataclasses
+from django.utils.translation import get_language
 
+from main.caches import CacheKey
 from apps.user.enums import enum_map as user_enum_map
 from apps.common.enums import enum_map as common_enum_map
 
@@ -55,16 +58,21 @@ def generate_type_for_enum(name, Enum):
 
 def _enum_type(name, Enum):
     EnumType = generate_type_for_enum(name, Enum)
+    # Materialised once per language (Labels can be lazy translations)
+    language_items: dict[str, list] = {}
 
     @strawberry.field
     def _field() -> list[EnumType]:
-        return [
-            EnumType(
-                key=e,
-                label=e.label,
-            )
-            for e in Enum
-        ]
+        language = get_language()
+        if (items := language_items.get(language)) is None:
+            items = language_items[language] = [
+                EnumType(
+                    key=e,
+                    label=str(e.label),
+                )
+                for e in Enum
+            ]
+        return items
 
     return list[EnumType], _field
 
@@ -82,3 +90,21 @@ def generate_type_for_enums():
 
 
 AppEnumCollection = generate_type_for_enums()
+
+
+_ENUMS_ETAG: dict[str, str] = {}
+
+
+def get_enums_etag() -> str:
+    """
+    Changes only if the enums (or the labels) are changed, clients can skip fetching the enums if unchanged
+    """
+    language = get_language()
+    if (etag := _ENUMS_ETAG.get(language)) is None:
+        etag = _ENUMS_ETAG[language] = CacheKey.generate_hash(
+            json.dumps([
+                (field_name, language, [(e.name, str(e.label)) for e in enum])
+                for field_name, enum in ENUM_TO_STRAWBERRY_ENUM_MAP.items()
+            ])
+        )
+    return etag
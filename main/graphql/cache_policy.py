@@ -0,0 +1,103 @@
+import dataclasses
+
+from django.conf import settings
+from django.utils.cache import patch_cache_control, patch_vary_headers
+from graphql import DocumentNode, GraphQLObjectType, OperationType, SelectionSetNode, get_named_type, get_operation_ast
+from graphql.type.schema import GraphQLSchema
+from strawberry.extensions import SchemaExtension
+
+from utils.strawberry.cost import get_fragments, iter_field_nodes
+
+
+@dataclasses.dataclass(frozen=True)
+class CachePolicy:
+    max_age: int
+    # Used to invalidate the server-side response cache (Check main.graphql.response_cache)
+    tags: frozenset[str] = frozenset()
+
+
+# Cacheable if all the selected sub-fields are cacheable
+SUB_SELECTION = object()
+
+
+ENUMS_CACHE_POLICY = CachePolicy(max_age=settings.GRAPHQL_ENUMS_CACHE_MAX_AGE, tags=frozenset(['enums']))
+PUBLIC_CACHE_POLICY = CachePolicy(max_age=settings.GRAPHQL_PUBLIC_CACHE_MAX_AGE, tags=frozenset(['public']))
+
+# <Type>.<field>: Only these fields (and their sub-fields) are cacheable, the data should not depend on the user
+FIELD_CACHE_POLICIES: dict[str, CachePolicy | object] = {
+    'Query.enums': ENUMS_CACHE_POLICY,
+    'Query.enumsEtag': ENUMS_CACHE_POLICY,
+    'Query.public': SUB_SELECTION,
+    'PublicQuery.id': PUBLIC_CACHE_POLICY,
+}
+
+
+def get_operation_cache_policy(
+    schema: GraphQLSchema,
+    document: DocumentNode,
+    operation_name: str | None,
+) -> CachePolicy | None:
+    """
+    Returns the policy with the least max_age (and all the tags) of the selected fields
+    None if any of them are not cacheable
+    """
+    operation = get_operation_ast(document, operation_name)
+    if operation is None or operation.operation != OperationType.QUERY:
+        return None
+    fragments = get_fragments(document)
+    policies = []
+
+    def _is_cacheable(parent_type, selection_set: SelectionSetNode | None) -> bool:
+        if selection_set is None or not isinstance(parent_type, GraphQLObjectType):
+            return False
+        for node in iter_field_nodes(selection_set, fragments):
+            name = node.name.value
+            if name == '__typename':
+                continue
+            policy = FIELD_CACHE_POLICIES.get(f'{parent_type.name}.{name}')
+            if policy is None or name not in parent_type.fields:
+                return False
+            if policy is SUB_SELECTION:
+                if not _is_cacheable(get_named_type(parent_type.fields[name].type), node.selection_set):
+                    return False
+            else:
+                policies.append(policy)
+        return True
+
+    if not _is_cacheable(schema.get_root_type(OperationType.QUERY), operation.selection_set) or not policies:
+        return None
+    return CachePolicy(
+        max_age=min(policy.max_age for policy in policies),
+        tags=frozenset().union(*[policy.tags for policy in policies]),
+    )
+
+
+class CachePolicyExtension(SchemaExtension):
+    """
+    Add Cache-Control headers for successful GET operations with only cacheable fields (Check FIELD_CACHE_POLICIES)
+    ETag and If-None-Match are handled by CustomAsyncGraphQLView
+    NOTE: POST responses are not cached by the browsers/CDN, use GET (with persisted queries) for cacheable operations
+    """
+
+    def on_execute(self):
+        yield
+        execution_context = self.execution_context
+        result = execution_context.result
+        request = execution_context.context.request
+        if (
+            request.method != 'GET' or
+            execution_context.graphql_document is None or
+            result is None or
+            result.errors
+        ):
+            return
+        policy = get_operation_cache_policy(
+            execution_context.schema._schema,
+            execution_context.graphql_document,
+            execution_context.operation_name,
+        )
+        if policy is None:
+            return
+        response = execution_context.context.response
+        patch_cache_control(response, public=True, max_age=policy.max_age)
+        patch_vary_headers(response, ['Accept-Language'])
@@ -0,0 +1,29 @@
+from dataclasses import dataclass, field
+
+from django.contrib.auth.models import AnonymousUser
+from strawberry.django.context import StrawberryDjangoContext
+
+from apps.user.models import User
+from apps.common.models import GlobalPermission
+from apps.common.serializers import ClientIdRegistry
+
+from .dataloaders import GlobalDataLoader
+
+
+@dataclass
+class GraphQLContext(StrawberryDjangoContext):
+    global_permissions: set[GlobalPermission.Type]
+    dl: GlobalDataLoader
+    client_ids: ClientIdRegistry = field(default_factory=ClientIdRegistry)
+
+    @property
+    def user(self) -> User | AnonymousUser:
+        # NOTE: request.user is lazy, it's loaded (using the session) by CustomAsyncGraphQLView.get_context
+        # Same instance is used by login/logout, so this is always in sync
+        return self.request.user
+
+    def get_serializer_context(self) -> dict:
+        return {
+            'request': self.request,
+            'client_ids': self.client_ids,
+        }
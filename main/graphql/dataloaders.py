@@ -1,24 +1,29 @@
 from django.utils.functional import cached_property
 
-from apps.questionnaire.dataloaders import QuestionnaireDataLoader
-from apps.qbank.dataloaders import QBankDataLoader
-from apps.project.dataloaders import ProjectDataLoader
+from utils.strawberry.dataloaders import InstrumentedDataLoader, DataLoaderStats
+from apps.user.dataloaders import UserDataLoader
+from apps.common.dataloaders import CommonDataLoader
 
 
 class GlobalDataLoader:
+    """
+    Created per request (Check main.graphql.context.GraphQLContext)
+    App dataloaders are created lazily and are shared by all the resolvers of the request.
+    """
 
     @cached_property
-    def questionnaire(self):
-        return QuestionnaireDataLoader()
+    def common(self):
+        return CommonDataLoader()
 
     @cached_property
     def user(self):
         return UserDataLoader()
 
-    @cached_property
-    def qbank(self):
-        return QBankDataLoader()
-
-    @cached_property
-    def project(self):
-        return ProjectDataLoader()
+    def get_stats(self) -> dict[str, DataLoaderStats]:
+        # Only the dataloaders used by the request are available in __dict__
+        return {
+            f'{app_name}.{loader_name}': loader.stats
+            for app_name, app_dataloader in vars(self).items()
+            for loader_name, loader in vars(app_dataloader).items()
+            if isinstance(loader, InstrumentedDataLoader)
+        }
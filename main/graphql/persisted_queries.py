@@ -0,0 +1,124 @@
+import hashlib
+
+from django.conf import settings
+from django.core.cache import cache
+
+from main.caches import CacheKey, LocalTTLCache
+
+
+class PersistedQueryError(Exception):
+    """
+    Returned as a GraphQL error (Apollo APQ protocol), so that the clients can retry with the query
+    """
+    message: str
+    code: str
+
+
+class PersistedQueryNotFound(PersistedQueryError):
+    message = 'PersistedQueryNotFound'
+    code = 'PERSISTED_QUERY_NOT_FOUND'
+
+
+class PersistedQueryNotSupported(PersistedQueryError):
+    message = 'PersistedQueryNotSupported'
+    code = 'PERSISTED_QUERY_NOT_SUPPORTED'
+
+
+class PersistedQueryHashMismatch(PersistedQueryError):
+    message = 'provided sha does not match query'
+    code = 'PERSISTED_QUERY_HASH_MISMATCH'
+
+
+class PersistedQueryNotAllowed(PersistedQueryError):
+    message = 'Only persisted queries are allowed'
+    code = 'PERSISTED_QUERY_NOT_ALLOWED'
+
+
+def get_query_hash(query: str) -> str:
+    return hashlib.sha256(query.encode()).hexdigest()
+
+
+class PersistedQueryRegistry:
+    """
+    Queries are resolved using sha256 hash: Local LRU -> Redis
+    - Persisted (allow-listed) queries: Loaded from the frontend manifest (Check load_persisted_queries)
+    - Automatic persisted queries (APQ): Registered by the clients, expires after GRAPHQL_APQ_TTL
+    With GRAPHQL_PERSISTED_QUERIES_ONLY, APQ is disabled and only persisted queries are allowed.
+    """
+    local_cache = LocalTTLCache(
+        maxsize=settings.GRAPHQL_PERSISTED_QUERY_LOCAL_CACHE_MAXSIZE,
+        ttl=settings.GRAPHQL_PERSISTED_QUERY_LOCAL_CACHE_TTL,
+    )
+
+    @classmethod
+    def get_cache_keys(cls, query_hash: str) -> list[str]:
+        cache_keys = [CacheKey.GRAPHQL_PERSISTED_QUERY_KEY_FORMAT.format(query_hash)]
+        if not settings.GRAPHQL_PERSISTED_QUERIES_ONLY:
+            cache_keys.append(CacheKey.GRAPHQL_APQ_KEY_FORMAT.format(query_hash))
+        return cache_keys
+
+    @classmethod
+    def get(cls, query_hash: str) -> str | None:
+        if query := cls.local_cache.get(query_hash):
+            return query
+        cache_keys = cls.get_cache_keys(query_hash)
+        queries = cache.get_many(cache_keys)
+        for cache_key in cache_keys:
+            if query := queries.get(cache_key):
+                cls.local_cache.set(query_hash, query)
+                return query
+
+    @classmethod
+    def register(cls, query_hash: str, query: str):
+        if get_query_hash(query) != query_hash:
+            raise PersistedQueryHashMismatch
+        cls.local_cache.set(query_hash, query)
+        cache.set(
+            CacheKey.GRAPHQL_APQ_KEY_FORMAT.format(query_hash),
+            query,
+            settings.GRAPHQL_APQ_TTL,
+        )
+
+    @classmethod
+    def persist_many(cls, queries: dict[str, str]):
+        for query_hash, query in queries.items():
+            if get_query_hash(query) != query_hash:
+                raise PersistedQueryHashMismatch
+        cache.set_many(
+            {
+                CacheKey.GRAPHQL_PERSISTED_QUERY_KEY_FORMAT.format(query_hash): query
+                for query_hash, query in queries.items()
+            },
+            None,
+        )
+
+
+def resolve_persisted_query(data: dict) -> str | None:
+    """
+    Returns the query for the request data using `extensions.persistedQuery`
+    https://github.com/apollographql/apollo-link-persisted-queries#protocol
+    """
+    query = data.get('query')
+    persisted_query = (data.get('extensions') or {}).get('persistedQuery')
+    if not persisted_query:
+        if query and settings.GRAPHQL_PERSISTED_QUERIES_ONLY:
+            if PersistedQueryRegistry.get(get_query_hash(query)) is None:
+                raise PersistedQueryNotAllowed
+        return query
+
+    query_hash = persisted_query.get('sha256Hash')
+    if persisted_query.get('version') != 1 or not query_hash:
+        raise PersistedQueryNotSupported
+
+    if query is None:
+        if (query := PersistedQueryRegistry.get(query_hash)) is None:
+            raise PersistedQueryNotFound
+        return query
+
+    # Client is registering the query (APQ)
+    if settings.GRAPHQL_PERSISTED_QUERIES_ONLY:
+        if PersistedQueryRegistry.get(query_hash) is None:
+            raise PersistedQueryNotAllowed
+    else:
+        PersistedQueryRegistry.register(query_hash, query)
+    return query
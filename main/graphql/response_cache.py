@@ -0,0 +1,131 @@
+import hashlib
+import json
+import time
+import typing
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.translation import get_language
+from graphql import ExecutionResult as GraphQLExecutionResult
+from strawberry.extensions import SchemaExtension
+
+from main.caches import CacheKey, TwoTierCache
+
+from .cache_policy import CachePolicy, get_operation_cache_policy
+
+
+class ResponseCache:
+    """
+    Server-side cache for the anonymous operations with only cacheable fields: Local LRU -> Redis
+    - Keyed by the query hash, operation name, variables, language and the versions of the policy tags
+    - Use invalidate_tags to drop the cached responses for the tags (Check FIELD_CACHE_POLICIES)
+    """
+    cache: TwoTierCache[str, dict] = TwoTierCache(
+        CacheKey.GRAPHQL_RESPONSE_CACHE_NAMESPACE,
+        timeout=settings.GRAPHQL_RESPONSE_CACHE_TTL,
+        local_maxsize=settings.GRAPHQL_RESPONSE_CACHE_LOCAL_MAXSIZE,
+        local_ttl=settings.GRAPHQL_RESPONSE_CACHE_LOCAL_TTL,
+    )
+
+    @staticmethod
+    def get_tag_version_cache_key(tag: str) -> str:
+        return CacheKey.GRAPHQL_RESPONSE_CACHE_TAG_VERSION_KEY_FORMAT.format(tag)
+
+    @classmethod
+    def get_tag_versions(cls, tags: typing.Iterable[str]) -> list[tuple[str, typing.Any]]:
+        tags = sorted(tags)
+        cache_keys = {
+            tag: cls.get_tag_version_cache_key(tag)
+            for tag in tags
+        }
+        versions = cache.get_many(cache_keys.values())
+        tag_versions = []
+        for tag in tags:
+            if (version := versions.get(cache_keys[tag])) is None:
+                # NOTE: Not using a counter, a evicted version should not match the old entries
+                cache.add(cache_keys[tag], time.time_ns(), None)
+                version = cache.get(cache_keys[tag])
+            tag_versions.append((tag, version))
+        return tag_versions
+
+    @classmethod
+    def invalidate_tags(cls, *tags: str):
+        version = time.time_ns()
+        cache.set_many(
+            {
+                cls.get_tag_version_cache_key(tag): version
+                for tag in tags
+            },
+            None,
+        )
+
+    @classmethod
+    def get_cache_key(cls, query: str, operation_name: str | None, variables: dict | None, policy: CachePolicy) -> str:
+        return hashlib.sha256(
+            json.dumps(
+                [
+                    query,
+                    operation_name,
+                    variables,
+                    get_language(),
+                    cls.get_tag_versions(policy.tags),
+                ],
+                sort_keys=True,
+            ).encode()
+        ).hexdigest()
+
+    @classmethod
+    def get(cls, cache_key: str) -> dict | None:
+        return cls.cache.get(cache_key)
+
+    @classmethod
+    def set(cls, cache_key: str, data: dict, policy: CachePolicy):
+        cls.cache.set(cache_key, data, timeout=min(policy.max_age, settings.GRAPHQL_RESPONSE_CACHE_TTL))
+
+
+class ResponseCacheExtension(SchemaExtension):
+    """
+    Skip the execution for cached responses (Opt-in using GRAPHQL_RESPONSE_CACHE)
+    NOTE: Pass the class (not an instance) to the schema, the cache key is stored per execution
+    """
+
+    cache_key: str | None = None
+    policy: CachePolicy | None = None
+
+    def get_policy(self) -> CachePolicy | None:
+        execution_context = self.execution_context
+        user = getattr(execution_context.context, 'user', None)
+        if (
+            not settings.GRAPHQL_RESPONSE_CACHE or
+            execution_context.graphql_document is None or
+            execution_context.query is None or
+            user is None or
+            user.is_authenticated
+        ):
+            return None
+        return get_operation_cache_policy(
+            execution_context.schema._schema,
+            execution_context.graphql_document,
+            execution_context.operation_name,
+        )
+
+    def on_execute(self):
+        execution_context = self.execution_context
+        if execution_context.result is None and (policy := self.get_policy()):
+            self.policy = policy
+            self.cache_key = ResponseCache.get_cache_key(
+                execution_context.query,
+                execution_context.operation_name,
+                execution_context.variables,
+                policy,
+            )
+            if (data := ResponseCache.get(self.cache_key)) is not None:
+                # Strawberry skips the execution if result is already set
+                execution_context.result = GraphQLExecutionResult(data=data)
+                yield
+                return
+        yield
+        result = execution_context.result
+        if self.cache_key is None or self.policy is None or result is None or result.errors:
+            return
+        ResponseCache.set(self.cache_key, result.data, self.policy)
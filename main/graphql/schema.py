@@ -1,31 +1,189 @@
+import json
+import logging
+import re
+
 import strawberry
+from strawberry import UNSET
 from asgiref.sync import sync_to_async
-from dataclasses import dataclass
+from django.conf import settings
+from django.http import HttpRequest, HttpResponse
+from django.utils.cache import get_conditional_response, set_response_etag
+from graphql import GraphQLError
 from strawberry.django.views import AsyncGraphQLView
+from strawberry.extensions import QueryDepthLimiter
+from strawberry.http import GraphQLRequestData
+from strawberry.http.async_base_view import AsyncHTTPRequestAdapter
+from strawberry.http.exceptions import HTTPException
+from strawberry.exceptions import MissingQueryError
+from strawberry.types import ExecutionResult
+from strawberry.types.graphql import OperationType
 
-from main.enums import AppEnumCollection, AppEnumCollectionData
+from utils.strawberry.extensions import DocumentCacheExtension, QueryCostExtension, TimingExtension
+from main.enums import AppEnumCollection, AppEnumCollectionData, get_enums_etag
 from apps.common.enums import GlobalPermissionTypeEnum
+from apps.common.models import GlobalPermissionCache
 from apps.user.models import User
 
 from apps.user import queries as user_queries, mutations as user_mutations
 
 from .permissions import IsAuthenticated
+from .context import GraphQLContext
+from .dataloaders import GlobalDataLoader
+from .persisted_queries import PersistedQueryError, resolve_persisted_query
+from .cache_policy import CachePolicyExtension
+from .response_cache import ResponseCacheExtension
 
-
-@dataclass
-class UserContext:
-    user: User
-    permissions: set[User.Permission]
+logger = logging.getLogger(__name__)
 
 
 class CustomAsyncGraphQLView(AsyncGraphQLView):
     @staticmethod
     @sync_to_async
     def get_global_permissions(user: User) -> set[GlobalPermissionTypeEnum]:
+        # NOTE: Also loads the lazy request.user (session + user), used as context.user by the async resolvers
         if not user.is_anonymous:
-            return user.get_global_permissions()
+            return GlobalPermissionCache.get(user)
         return set()
 
+    async def get_context(self, request: HttpRequest, response: HttpResponse) -> GraphQLContext:
+        # NOTE: Context (and the dataloaders) are dropped with the request
+        return GraphQLContext(
+            request=request,
+            response=response,
+            global_permissions=await self.get_global_permissions(request.user),
+            dl=GlobalDataLoader(),
+        )
+
+    @staticmethod
+    def is_batch_request(request: HttpRequest) -> bool:
+        return (
+            request.method == 'POST' and
+            'application/json' in (request.content_type or '') and
+            request.body.lstrip()[:1] == b'['
+        )
+
+    async def run(self, request: HttpRequest, context=UNSET, root_value=UNSET):
+        if self.is_batch_request(request):
+            return await self.run_batch(request)
+        response = await super().run(request, context=context, root_value=root_value)
+        # Cache-Control is only set for cacheable operations (Check CachePolicyExtension)
+        if (
+            request.method == 'GET' and
+            response.status_code == 200 and
+            response.has_header('Cache-Control')
+        ):
+            set_response_etag(response)
+            if conditional_response := get_conditional_response(
+                request,
+                etag=response['ETag'],
+                response=response,
+            ):
+                return conditional_response
+        return response
+
+    def parse_query_params(self, params):
+        params = super().parse_query_params(params)
+        # Persisted queries using GET
+        if extensions := params.get('extensions'):
+            if isinstance(extensions, list):
+                extensions = extensions[0]
+            try:
+                params['extensions'] = json.loads(extensions)
+            except json.JSONDecodeError:
+                raise HTTPException(400, 'Unable to parse request extensions')
+        return params
+
+    async def parse_http_body(self, request: AsyncHTTPRequestAdapter) -> GraphQLRequestData:
+        # Same as AsyncBaseHTTPView.parse_http_body, with persisted query support
+        content_type = request.content_type or ''
+        if 'application/json' in content_type:
+            data = self.parse_json(await request.get_body())
+        elif content_type.startswith('multipart/form-data'):
+            data = await self.parse_multipart(request)
+        elif request.method == 'GET':
+            data = self.parse_query_params(request.query_params)
+        else:
+            raise HTTPException(400, 'Unsupported content type')
+
+        return self.get_request_data(data)
+
+    @staticmethod
+    def get_request_data(data: dict) -> GraphQLRequestData:
+        return GraphQLRequestData(
+            query=resolve_persisted_query(data),
+            variables=data.get('variables'),  # type: ignore
+            operation_name=data.get('operationName'),
+        )
+
+    @staticmethod
+    def get_error_result(message: str, code: str | None = None) -> ExecutionResult:
+        return ExecutionResult(
+            data=None,
+            errors=[GraphQLError(message, extensions={'code': code} if code else None)],
+        )
+
+    async def run_batch(self, request: HttpRequest) -> HttpResponse:
+        """
+        Execute a list of operations using a single context (session, permissions and dataloaders)
+        Operations are executed in order, each operation has it's own errors
+        """
+        operations = self.parse_json(request.body)
+        if not operations:
+            raise HTTPException(400, 'No GraphQL operations found in the request')
+        if len(operations) > settings.GRAPHQL_MAX_BATCH_SIZE:
+            raise HTTPException(400, f'Too many operations, max allowed: {settings.GRAPHQL_MAX_BATCH_SIZE}')
+
+        sub_response = await self.get_sub_response(request)
+        context = await self.get_context(request, response=sub_response)
+        root_value = await self.get_root_value(request)
+        response_data = []
+        for data in operations:
+            result = await self.execute_batch_operation(data, context, root_value)
+            response_data.append(await self.process_result(request=request, result=result))
+        self.log_dataloader_stats(context)
+        return self.create_response(
+            response_data=response_data,  # type: ignore
+            sub_response=sub_response,
+        )
+
+    async def execute_batch_operation(self, data, context: GraphQLContext, root_value) -> ExecutionResult:
+        if not isinstance(data, dict):
+            return self.get_error_result('Invalid GraphQL operation')
+        try:
+            request_data = self.get_request_data(data)
+            return await self.schema.execute(
+                request_data.query,
+                root_value=root_value,
+                variable_values=request_data.variables,
+                context_value=context,
+                operation_name=request_data.operation_name,
+                allowed_operation_types=OperationType.from_http('POST'),
+            )
+        except PersistedQueryError as e:
+            return self.get_error_result(e.message, e.code)
+        except MissingQueryError:
+            return self.get_error_result('No GraphQL query found in the request')
+
+    def log_dataloader_stats(self, context: GraphQLContext):
+        if dataloader_stats := context.dl.get_stats():
+            logger.debug(
+                'GraphQL dataloader stats',
+                extra={
+                    'dataloader_stats': {
+                        name: stats.as_dict()
+                        for name, stats in dataloader_stats.items()
+                    },
+                },
+            )
+
+    async def execute_operation(self, request: HttpRequest, context: GraphQLContext, root_value):
+        try:
+            result = await super().execute_operation(request, context, root_value)
+        except PersistedQueryError as e:
+            return self.get_error_result(e.message, e.code)
+        self.log_dataloader_stats(context)
+        return result
+
 
 @strawberry.type
 class PublicQuery(
@@ -67,6 +225,10 @@ class Query:
     enums: AppEnumCollection = strawberry.field(
         resolver=lambda: AppEnumCollectionData()
     )
+    enums_etag: str = strawberry.field(
+        resolver=get_enums_etag,
+        description='Changes only if the enums are changed, use it to skip fetching the enums',
+    )
 
 
 @strawberry.type
@@ -81,4 +243,15 @@ class Mutation:
 schema = strawberry.Schema(
     query=Query,
     mutation=Mutation,
+    extensions=[
+        QueryDepthLimiter(
+            max_depth=settings.GRAPHQL_MAX_QUERY_DEPTH,
+            ignore=[re.compile(r'^__')],  # Introspection
+        ),
+        DocumentCacheExtension,
+        ResponseCacheExtension,
+        QueryCostExtension,
+        CachePolicyExtension,
+        TimingExtension,
+    ],
 )
@@ -41,7 +41,9 @@ env = environ.Env(
     DJANGO_MEDIA_ROOT=(str, os.path.join(BASE_DIR, 'assets/media')),  # Where to store
     # -- S3
     DJANGO_USE_S3=(bool, False),
-    MEDIA_FILE_CACHE_URL_TTL=(int, 86400),  # 1 day default
+    MEDIA_FILE_CACHE_URL_TTL=(int, 86400),  # 1 day default (Only for the URLs without signature)
+    MEDIA_FILE_URL_EXPIRY_MARGIN=(int, 60 * 60),  # Signed URLs are not served within this window of the expiry
+    MEDIA_FILE_URL_REFRESH_AHEAD=(int, 60 * 60 * 12),  # Signed URLs are refreshed within this window of the expiry
     TEMP_FILE_DIR=(str, '/tmp/'),
     AWS_S3_BUCKET_STATIC=str,
     AWS_S3_BUCKET_MEDIA=str,
@@ -87,6 +89,16 @@ env = environ.Env(
     # MISC
     ALLOW_DUMMY_DATA_SCRIPT=(bool, False),  # WARNING
     ENABLE_BREAKING_MODE=(bool, False),  # Only enable if you know what you are doing
+    # Cache
+    USER_DATALOADER_SHARED_CACHE=(bool, True),  # Cache user display data across requests
+    # GraphQL
+    GRAPHQL_PERSISTED_QUERIES_ONLY=(bool, False),  # Allow-list mode (Check load_persisted_queries)
+    GRAPHQL_TIMING_SAMPLE_RATE=(float, 0.0),  # Resolver timing/SQL attribution (Sent to sentry)
+    GRAPHQL_TIMING_IN_RESPONSE=(bool, False),  # Return extensions.timing (Only with DEBUG)
+    GRAPHQL_RESPONSE_CACHE=(bool, False),  # Server-side cache for anonymous operations
+    GRAPHQL_MAX_QUERY_DEPTH=(int, 10),
+    GRAPHQL_MAX_OPERATION_COST=(int, 5000),
+    GRAPHQL_USER_COST_BUDGET=(int, 0),  # Per GRAPHQL_USER_COST_BUDGET_WINDOW (0: disabled)
 )
 
 # Quick-start development settings - unsuitable for production
@@ -118,6 +130,7 @@ INSTALLED_APPS = [
     'django.contrib.messages',
     'django.contrib.staticfiles',
     'django.contrib.gis',
+    'django.contrib.postgres',
 
     # External apps
     'prettyjson',
@@ -233,6 +246,9 @@ STORAGES = {
 
 TEMP_FILE_DIR = env('TEMP_FILE_DIR')
 MEDIA_FILE_CACHE_URL_TTL = env('MEDIA_FILE_CACHE_URL_TTL')
+MEDIA_FILE_URL_EXPIRY_MARGIN = env('MEDIA_FILE_URL_EXPIRY_MARGIN')
+MEDIA_FILE_URL_REFRESH_AHEAD = max(env('MEDIA_FILE_URL_REFRESH_AHEAD'), MEDIA_FILE_URL_EXPIRY_MARGIN)
+MEDIA_FILE_URL_REFRESH_LOCK_TTL = 60  # Only one refresh per URL (across processes) within this duration
 
 if env('DJANGO_USE_S3'):
     # AWS S3 Bucket Credentials
@@ -395,6 +411,43 @@ else:
 # -- Pagination
 DEFAULT_PAGINATION_LIMIT = 50
 MAX_PAGINATION_LIMIT = 100
+# -- -- Count (Used by CountStrategy.ESTIMATED/CACHED)
+PAGINATION_ESTIMATED_COUNT_THRESHOLD = 10000
+PAGINATION_COUNT_CACHE_TTL = 60 * 5
+
+# -- Persisted queries
+GRAPHQL_PERSISTED_QUERIES_ONLY = env('GRAPHQL_PERSISTED_QUERIES_ONLY')
+GRAPHQL_APQ_TTL = 60 * 60 * 24 * 7
+GRAPHQL_PERSISTED_QUERY_LOCAL_CACHE_TTL = 60 * 60
+GRAPHQL_PERSISTED_QUERY_LOCAL_CACHE_MAXSIZE = 1000
+# -- Parsed/Validated documents
+GRAPHQL_DOCUMENT_CACHE_MAXSIZE = 500
+GRAPHQL_DOCUMENT_CACHE_TTL = 60 * 60 * 24
+# -- Resolver timing
+GRAPHQL_TIMING_SAMPLE_RATE = env('GRAPHQL_TIMING_SAMPLE_RATE')
+GRAPHQL_TIMING_IN_RESPONSE = env('GRAPHQL_TIMING_IN_RESPONSE')
+GRAPHQL_TIMING_SPAN_MIN_MS = 5
+# -- HTTP caching (Check main.graphql.cache_policy)
+GRAPHQL_ENUMS_CACHE_MAX_AGE = 60 * 60
+GRAPHQL_PUBLIC_CACHE_MAX_AGE = 60 * 5
+GRAPHQL_RESPONSE_CACHE = env('GRAPHQL_RESPONSE_CACHE')
+GRAPHQL_RESPONSE_CACHE_TTL = 60 * 60
+GRAPHQL_RESPONSE_CACHE_LOCAL_TTL = 60
+GRAPHQL_RESPONSE_CACHE_LOCAL_MAXSIZE = 500
+# -- Batched operations (JSON list of operations in a single request)
+GRAPHQL_MAX_BATCH_SIZE = 10
+# -- Depth/Cost limits (Check utils.strawberry.cost)
+GRAPHQL_MAX_QUERY_DEPTH = env('GRAPHQL_MAX_QUERY_DEPTH')
+GRAPHQL_MAX_OPERATION_COST = env('GRAPHQL_MAX_OPERATION_COST')
+GRAPHQL_USER_COST_BUDGET = env('GRAPHQL_USER_COST_BUDGET')
+GRAPHQL_USER_COST_BUDGET_WINDOW = 60
+GRAPHQL_COST_DEFAULT_LIST_SIZE = 10
+GRAPHQL_COST_WEIGHTS = {
+    'scalar': 0.1,
+    'object': 1,
+    'dataloader': 2,
+    'resolver': 5,
+}
 
 # Redis
 CELERY_REDIS_URL = env('CELERY_REDIS_URL')
@@ -417,6 +470,15 @@ CACHES = {
     }
 }
 
+# -- UserDataLoader shared cache (Local LRU -> Redis -> Database)
+USER_DATALOADER_SHARED_CACHE = env('USER_DATALOADER_SHARED_CACHE')
+USER_DATALOADER_CACHE_TTL = 60 * 60  # Redis
+USER_DATALOADER_LOCAL_CACHE_TTL = 30  # Local (Not invalidated by other processes)
+USER_DATALOADER_LOCAL_CACHE_MAXSIZE = 2000
+GLOBAL_PERMISSION_CACHE_TTL = 60 * 60 * 24
+GLOBAL_PERMISSION_LOCAL_CACHE_TTL = 60
+GLOBAL_PERMISSION_LOCAL_CACHE_MAXSIZE = 2000
+
 # Celery
 CELERY_BROKER_URL = CELERY_REDIS_URL
 CELERY_RESULT_BACKEND = CELERY_REDIS_URL
@@ -3,10 +3,14 @@ from enum import Enum
 
 from django.test import TestCase as BaseTestCase, override_settings
 from django.conf import settings
-from django.db import models
+from django.db import connection, models
+from django.test.utils import CaptureQueriesContext
 
 from apps.common.models import GlobalPermission
 from apps.common.factories import GlobalPermissionFactory
+from apps.common.dataloaders import FileUrlCache
+from main.graphql.persisted_queries import PersistedQueryRegistry
+from main.caches import TwoTierCache
 
 
 TEST_CACHES = {
@@ -69,6 +73,9 @@ class TestCase(BaseTestCase):
         from django.core.cache import cache
         # Clear all test cache
         cache.clear()
+        TwoTierCache.clear_all_local()
+        PersistedQueryRegistry.local_cache.clear()
+        FileUrlCache.clear()
         self.setup_global_permissions()
         super().setUp()
 
@@ -90,8 +97,26 @@ class TestCase(BaseTestCase):
         assert_errors: bool = False,
         variables: dict | None = None,
         files: dict | None = None,
+        max_queries: int | None = None,
+        max_db_time_ms: float | None = None,
         **kwargs,
     ) -> Dict:
+        """
+        max_queries: SQL queries budget for the operation, used to catch N+1 regressions
+        max_db_time_ms: Opt-in SQL time budget, depends on the machine (Avoid in CI, use max_queries instead)
+        Captured queries are available as self.captured_queries
+        """
+        with CaptureQueriesContext(connection) as context:
+            response = self._query_request(query, variables, files, **kwargs)
+        self.captured_queries = context.captured_queries
+        if assert_errors:
+            self.assertResponseHasErrors(response)
+        else:
+            self.assertResponseNoErrors(response)
+        self.assertQueryBudget(max_queries=max_queries, max_db_time_ms=max_db_time_ms)
+        return response.json()
+
+    def _query_request(self, query: str, variables: dict | None, files: dict | None, **kwargs):
         import json
         if files:
             # Request type: form data
@@ -118,11 +143,26 @@ class TestCase(BaseTestCase):
                 content_type="application/json",
                 **kwargs,
             )
-        if assert_errors:
-            self.assertResponseHasErrors(response)
-        else:
-            self.assertResponseNoErrors(response)
-        return response.json()
+        return response
+
+    def assertQueryBudget(self, max_queries: int | None = None, max_db_time_ms: float | None = None):
+        queries = self.captured_queries
+        db_time_ms = sum(float(query['time']) for query in queries) * 1000
+        exceeded = []
+        if max_queries is not None and len(queries) > max_queries:
+            exceeded.append(f'Queries: {len(queries)} > {max_queries}')
+        if max_db_time_ms is not None and db_time_ms > max_db_time_ms:
+            exceeded.append(f'DB time: {db_time_ms:.2f}ms > {max_db_time_ms}ms')
+        if exceeded:
+            self.fail(
+                '\n'.join([
+                    'Query budget exceeded: ' + ', '.join(exceeded),
+                    *[
+                        f'{index}. [{float(query["time"]) * 1000:.2f}ms] {query["sql"]}'
+                        for index, query in enumerate(queries, start=1)
+                    ],
+                ])
+            )
 
     def assertResponseNoErrors(self, resp, msg=None):
         """
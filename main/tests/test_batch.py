@@ -0,0 +1,63 @@
+from django.test import override_settings
+
+from main.tests import TestCase
+
+from apps.user.factories import UserFactory
+
+
+class TestBatchedOperations(TestCase):
+    ME_QUERY = '''
+        query MyQuery {
+          public {
+            me {
+              id
+            }
+          }
+        }
+    '''
+
+    USERS_QUERY = '''
+        query MyQuery {
+          private {
+            users {
+              count
+            }
+          }
+        }
+    '''
+
+    def _batch_query(self, operations):
+        return self.client.post('/graphql/', data=operations, content_type='application/json')
+
+    def test_batch(self):
+        user = UserFactory.create()
+        self.force_login(user)
+        response = self._batch_query([
+            {'query': self.ME_QUERY},
+            {'query': self.USERS_QUERY},
+            {'query': 'query MyQuery { unknownField }'},
+            {'query': None},
+        ])
+        assert response.status_code == 200
+        content = response.json()
+        assert len(content) == 4
+        assert content[0] == {'data': {'public': {'me': {'id': self.gID(user.id)}}}}
+        assert content[1] == {'data': {'private': {'users': {'count': 1}}}}
+        # Errors are per operation
+        assert "Cannot query field 'unknownField'" in content[2]['errors'][0]['message']
+        assert content[3]['errors'][0]['message'] == 'No GraphQL query found in the request'
+
+    def test_batch_shared_context(self):
+        self.force_login(UserFactory.create())
+        self.query_check(self.ME_QUERY)  # Load the global permissions cache
+        # Session and user are loaded once
+        with self.assertNumQueries(2):
+            response = self._batch_query([{'query': self.ME_QUERY}] * 3)
+        assert len(response.json()) == 3
+
+    @override_settings(GRAPHQL_MAX_BATCH_SIZE=2)
+    def test_batch_size(self):
+        response = self._batch_query([{'query': self.ME_QUERY}] * 3)
+        assert response.status_code == 400
+        response = self._batch_query([])
+        assert response.status_code == 400
@@ -0,0 +1,66 @@
+from django.conf import settings
+
+from main.tests import TestCase
+
+
+class TestCachePolicy(TestCase):
+    ENUMS_QUERY = '''
+        query MyQuery {
+          enumsEtag
+          enums {
+            GlobalPermissionType {
+              key
+              label
+            }
+          }
+          public {
+            __typename
+            id
+          }
+        }
+    '''
+
+    ME_QUERY = '''
+        query MyQuery {
+          public {
+            id
+            me {
+              id
+            }
+          }
+        }
+    '''
+
+    def _get(self, query, **kwargs):
+        return self.client.get('/graphql/', data={'query': query}, **kwargs)
+
+    def test_cacheable_operation(self):
+        response = self._get(self.ENUMS_QUERY)
+        assert response.status_code == 200
+        assert response['Cache-Control'] == f'public, max-age={settings.GRAPHQL_PUBLIC_CACHE_MAX_AGE}'
+        etag = response['ETag']
+
+        # Same ETag for the same response
+        assert self._get(self.ENUMS_QUERY)['ETag'] == etag
+        response = self._get(self.ENUMS_QUERY, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 304
+        assert response.content == b''
+
+        # Not cacheable: POST request
+        response = self.client.post(
+            '/graphql/',
+            data={'query': self.ENUMS_QUERY},
+            content_type='application/json',
+        )
+        assert not response.has_header('Cache-Control')
+        assert not response.has_header('ETag')
+
+    def test_not_cacheable_operation(self):
+        for query in [
+            self.ME_QUERY,
+            # Errors
+            'query MyQuery { enums { unknownField } }',
+        ]:
+            response = self._get(query)
+            assert not response.has_header('Cache-Control')
+            assert not response.has_header('ETag')
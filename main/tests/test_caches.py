@@ -0,0 +1,104 @@
+import hashlib
+from unittest import mock
+
+from django.core.cache import cache
+
+from main.tests import TestCase
+from main.caches import CacheKey, HASH_ALGORITHM, TwoTierCache
+
+
+class TestTwoTierCache(TestCase):
+    def get_test_cache(self, namespace: str, **kwargs) -> TwoTierCache:
+        test_cache = TwoTierCache(namespace, **kwargs)
+        self.addCleanup(TwoTierCache.namespaces.pop, namespace)
+        return test_cache
+
+    def test_get_set(self):
+        test_cache: TwoTierCache[int, dict] = self.get_test_cache(
+            'test-two-tier-cache',
+            timeout=60,
+            local_maxsize=10,
+            local_ttl=60,
+        )
+        test_cache.set_many({1: {'id': 1}, 2: {'id': 2}})
+        assert cache.get('test-two-tier-cache-1') == {'id': 1}
+
+        assert test_cache.get_many([1, 2, 3]) == {1: {'id': 1}, 2: {'id': 2}}
+        test_cache.local_cache.clear()
+        assert test_cache.get(1) == {'id': 1}
+        test_cache.delete(1)
+        assert test_cache.get(1) is None
+        assert test_cache.stats.as_dict() == {
+            'local_hits': 2,
+            'hits': 1,
+            'misses': 2,
+            'hit_ratio': 3 / 5,
+        }
+        assert TwoTierCache.get_stats()['test-two-tier-cache'] == test_cache.stats
+
+    def test_versioned(self):
+        test_cache: TwoTierCache[tuple[str, int], int] = self.get_test_cache(
+            'test-two-tier-cache-versioned',
+            timeout=60,
+            versioned=True,
+            hash_keys=True,
+        )
+        test_cache.set(('SELECT', 1), 10)
+        assert test_cache.get(('SELECT', 1)) == 10
+        assert test_cache.make_key(('SELECT', 1), 'v1').startswith('test-two-tier-cache-versioned-v1-')
+
+        # All the entries are dropped
+        test_cache.invalidate()
+        assert test_cache.get(('SELECT', 1)) is None
+
+    def test_namespace_unique(self):
+        self.get_test_cache('test-two-tier-cache-unique')
+        with self.assertRaises(AssertionError):
+            TwoTierCache('test-two-tier-cache-unique')
+
+    def test_get_or_set(self):
+        test_cache: TwoTierCache[str, int] = self.get_test_cache('test-two-tier-cache-get-or-set', timeout=60)
+        default = mock.Mock(return_value=10)
+        with mock.patch.object(cache, 'add') as add_mock:
+            assert test_cache.get_or_set('count', default) == 10
+            assert test_cache.get_or_set('count', default) == 10
+        assert default.call_count == 1
+        # No lock without single_flight
+        add_mock.assert_not_called()
+
+    def test_get_or_set_single_flight(self):
+        test_cache: TwoTierCache[str, int] = self.get_test_cache(
+            'test-two-tier-cache-single-flight',
+            timeout=60,
+            single_flight=True,
+        )
+        default = mock.Mock(return_value=10)
+        assert test_cache.get_or_set('count', default) == 10
+        assert test_cache.get_or_set('count', default) == 10
+        assert default.call_count == 1
+        # Lock is released
+        assert cache.get(f"{test_cache.make_key('count')}-lock") is None
+
+        # Value is computed by other process (Lock is already acquired)
+        test_cache.delete('count')
+        cache.add(f"{test_cache.make_key('count')}-lock", 1, 10)
+        with mock.patch('main.caches.time.sleep') as sleep_mock:
+            sleep_mock.side_effect = lambda _: cache.set(test_cache.make_key('count'), 20)
+            assert test_cache.get_or_set('count', default) == 20
+        assert default.call_count == 1
+
+        # Not computed by the other process within lock_timeout, computed without the lock
+        test_cache.delete('count')
+        with mock.patch('main.caches.time') as time_mock:
+            time_mock.monotonic.side_effect = [0, 0.5, test_cache.lock_timeout + 1]
+            assert test_cache.get_or_set('count', default) == 10
+        assert time_mock.sleep.call_count == 1
+        assert default.call_count == 2
+
+
+class TestCacheKey(TestCase):
+    def test_generate_hash(self):
+        key_hash = CacheKey.generate_hash('media/user/avatar.png')
+        # 128 bits blake2b, prefixed with the algorithm
+        assert key_hash == f"{HASH_ALGORITHM}-{hashlib.blake2b(b'media/user/avatar.png', digest_size=16).hexdigest()}"
+        assert CacheKey.generate_hash('media/user/avatar-2.png') != key_hash
@@ -0,0 +1,41 @@
+import asyncio
+
+from asgiref.sync import async_to_sync
+
+from main.tests import TestCase
+from main.graphql.dataloaders import GlobalDataLoader
+from utils.strawberry.dataloaders import InstrumentedDataLoader
+
+
+class TestInstrumentedDataLoader(TestCase):
+    def test_stats(self):
+        async def load_fn(keys):
+            return [key * 2 for key in keys]
+
+        @async_to_sync
+        async def _test():
+            dataloader = InstrumentedDataLoader(load_fn=load_fn)
+            # Same key is requested multiple times (Only 2 unique keys)
+            assert await asyncio.gather(*[
+                dataloader.load(key)
+                for key in [1, 2, 1, 2]
+            ]) == [2, 4, 2, 4]
+            assert await dataloader.load(1) == 2
+            return dataloader.stats
+
+        stats = _test()
+        assert stats.as_dict() == {
+            'loads': 5,
+            'batches': 1,
+            'batch_keys': 2,
+            'max_batch_size': 2,
+            'hits': 3,
+        }
+
+    def test_global_dataloader_stats(self):
+        dl = GlobalDataLoader()
+        # Nothing is used yet
+        assert dl.get_stats() == {}
+        dl.user.load_users
+        dl.common.load_file_urls
+        assert list(dl.get_stats().keys()) == ['user.load_users', 'common.load_file_urls']
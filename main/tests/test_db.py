@@ -0,0 +1,47 @@
+from main.tests import TestCase
+from utils.db import execute_raw_query, exclude_related
+
+from apps.user.models import User
+from apps.user.factories import UserFactory
+from apps.common.models import GlobalPermission
+
+
+class TestExcludeRelated(TestCase):
+    def test_exclude_related(self):
+        user1, user2, user3 = UserFactory.create_batch(3)
+        upload_permission = self.global_permissions[GlobalPermission.Type.UPLOAD_QBANK]
+        activate_permission = self.global_permissions[GlobalPermission.Type.ACTIVATE_QBANK]
+        upload_permission.users.add(user1, user2)
+        activate_permission.users.add(user1, user3)
+
+        for queryset, filters, expected_users in [
+            # Reverse relation
+            (User.objects.all(), dict(type=GlobalPermission.Type.UPLOAD_QBANK), [user3]),
+            (User.objects.all(), dict(type=GlobalPermission.Type.ACTIVATE_QBANK), [user2]),
+            (User.objects.filter(id=user2.pk), dict(type=GlobalPermission.Type.ACTIVATE_QBANK), [user2]),
+        ]:
+            qs = exclude_related(queryset, 'globalpermission', **filters)
+            assert list(qs.order_by('id')) == expected_users
+            # Same as exclude + distinct
+            assert list(qs.order_by('id')) == list(
+                queryset.exclude(**{
+                    f'globalpermission__{key}': value
+                    for key, value in filters.items()
+                }).distinct().order_by('id')
+            )
+        # Forward ManyToMany
+        assert list(exclude_related(GlobalPermission.objects.all(), 'users', id=user2.pk)) == [activate_permission]
+
+    def test_exclude_related_query_plan(self):
+        queryset = exclude_related(
+            User.objects.all(),
+            'globalpermission',
+            type=GlobalPermission.Type.UPLOAD_QBANK,
+        )
+        sql, params = queryset.query.sql_with_params()
+        assert 'DISTINCT' not in sql
+        assert 'NOT EXISTS' in sql
+        plan = '\n'.join(execute_raw_query(f'EXPLAIN {sql}', params, flat=True))
+        # Executed as a anti-join (eg: Hash Anti Join, Hash Right Anti Join), without de-duplication of the user rows
+        assert 'Anti Join' in plan, plan
+        assert 'Unique' not in plan, plan
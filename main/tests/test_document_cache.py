@@ -0,0 +1,49 @@
+from main.tests import TestCase
+from utils.strawberry.extensions import DocumentCache
+
+
+class TestDocumentCache(TestCase):
+    QUERY = '''
+        query MyQuery {
+          public {
+            id
+          }
+        }
+    '''
+
+    INVALID_QUERY = '''
+        query MyQuery {
+          public {
+            invalidField
+          }
+        }
+    '''
+
+    def setUp(self):
+        super().setUp()
+        DocumentCache.clear()
+
+    def test_document_cache(self):
+        for _ in range(3):
+            self.query_check(self.QUERY)
+            content = self.query_check(self.INVALID_QUERY, assert_errors=True)
+            # Cached validation errors are still returned
+            assert "Cannot query field 'invalidField'" in content['errors'][0]['message']
+        # Syntax errors are not cached
+        self.query_check('query {', assert_errors=True)
+
+        assert DocumentCache.stats.as_dict() == {
+            'parse_hits': 4,
+            'parse_misses': 3,
+            'validation_hits': 4,
+            'validation_misses': 2,
+        }
+
+        DocumentCache.clear()
+        self.query_check(self.QUERY)
+        assert DocumentCache.stats.as_dict() == {
+            'parse_hits': 0,
+            'parse_misses': 1,
+            'validation_hits': 0,
+            'validation_misses': 1,
+        }
@@ -0,0 +1,31 @@
+from main.tests import TestCase
+from main.enums import get_enums_etag
+
+from apps.common.models import GlobalPermission
+
+
+class TestEnums(TestCase):
+    QUERY = '''
+        query MyQuery {
+          enumsEtag
+          enums {
+            GlobalPermissionType {
+              key
+              label
+            }
+          }
+        }
+    '''
+
+    def test_enums(self):
+        content = self.query_check(self.QUERY, max_queries=0)
+        assert content['data']['enums']['GlobalPermissionType'] == [
+            {
+                'key': self.genum(_type),
+                'label': _type.label,
+            }
+            for _type in GlobalPermission.Type
+        ]
+        # Same etag until the enums are changed
+        assert content['data']['enumsEtag'] == get_enums_etag()
+        assert self.query_check(self.QUERY)['data'] == content['data']
@@ -0,0 +1,75 @@
+import json
+
+from django.test import override_settings
+
+from main.tests import TestCase
+from main.graphql.persisted_queries import PersistedQueryRegistry, get_query_hash
+
+
+class TestPersistedQueries(TestCase):
+    QUERY = '''
+        query MyQuery {
+          public {
+            id
+          }
+        }
+    '''
+
+    def _query(self, query_hash, query=None, method='post'):
+        extensions = {
+            'persistedQuery': {
+                'version': 1,
+                'sha256Hash': query_hash,
+            },
+        }
+        if method == 'get':
+            return self.client.get(
+                '/graphql/',
+                data={
+                    'extensions': json.dumps(extensions),
+                    **({'query': query} if query else {}),
+                },
+            ).json()
+        return self.client.post(
+            '/graphql/',
+            data={
+                'query': query,
+                'extensions': extensions,
+            },
+            content_type='application/json',
+        ).json()
+
+    def test_automatic_persisted_queries(self):
+        query_hash = get_query_hash(self.QUERY)
+        # Unknown hash
+        content = self._query(query_hash)
+        assert content['errors'][0]['extensions']['code'] == 'PERSISTED_QUERY_NOT_FOUND'
+        # Invalid hash
+        content = self._query('invalid-hash', self.QUERY)
+        assert content['errors'][0]['extensions']['code'] == 'PERSISTED_QUERY_HASH_MISMATCH'
+        # Register
+        content = self._query(query_hash, self.QUERY)
+        assert 'errors' not in content, content
+        # Using hash only
+        PersistedQueryRegistry.local_cache.clear()
+        for method in ['post', 'get']:
+            content = self._query(query_hash, method=method)
+            assert 'errors' not in content, content
+            assert content['data']['public']['id'] is not None
+
+    @override_settings(GRAPHQL_PERSISTED_QUERIES_ONLY=True)
+    def test_persisted_queries_only(self):
+        query_hash = get_query_hash(self.QUERY)
+        # Not allowed to register or to send new queries
+        content = self._query(query_hash, self.QUERY)
+        assert content['errors'][0]['extensions']['code'] == 'PERSISTED_QUERY_NOT_ALLOWED'
+        content = self.query_check(self.QUERY, assert_errors=True)
+        assert content['errors'][0]['extensions']['code'] == 'PERSISTED_QUERY_NOT_ALLOWED'
+
+        PersistedQueryRegistry.persist_many({query_hash: self.QUERY})
+        PersistedQueryRegistry.local_cache.clear()
+        for content in [
+            self._query(query_hash),
+            self.query_check(self.QUERY),
+        ]:
+            assert 'errors' not in content, content
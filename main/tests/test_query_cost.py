@@ -0,0 +1,71 @@
+from django.test import override_settings
+
+from main.tests import TestCase
+
+from apps.user.factories import UserFactory
+
+
+class TestQueryCost(TestCase):
+    QUERY = '''
+        query MyQuery($limit: Int!) {
+          private {
+            users(pagination: {limit: $limit, offset: 0}) {
+              count
+              items {
+                id
+                firstName
+              }
+            }
+          }
+        }
+    '''
+
+    def setUp(self):
+        super().setUp()
+        self.user = UserFactory.create()
+        self.force_login(self.user)
+
+    @override_settings(GRAPHQL_MAX_OPERATION_COST=10)
+    def test_operation_cost(self):
+        # private + users + count + items + limit * (id + firstName)
+        self.query_check(self.QUERY, variables={'limit': 10})
+        content = self.query_check(self.QUERY, variables={'limit': 100}, assert_errors=True, max_queries=2)
+        assert content['data'] is None
+        assert content['errors'][0]['extensions'] == {
+            'code': 'OPERATION_COST_LIMIT_EXCEEDED',
+            'cost': 24,
+        }
+
+    def test_operation_cost_default_pagination(self):
+        query = '''
+            query MyQuery {
+              private {
+                users%s {
+                  items {
+                    id
+                    firstName
+                  }
+                }
+              }
+            }
+        '''
+
+        def get_cost(pagination: str) -> float:
+            with override_settings(GRAPHQL_MAX_OPERATION_COST=0):
+                content = self.query_check(query % pagination, assert_errors=True)
+            return content['errors'][0]['extensions']['cost']
+
+        # Without the argument, the default limit is used (Same as process_pagination)
+        assert get_cost('') == get_cost('(pagination: {limit: 50})')
+        assert get_cost('') == get_cost('(pagination: {offset: 10})')
+        # Limit is clamped
+        assert get_cost('(pagination: {limit: 1000})') == get_cost('(pagination: {limit: 100})')
+        # No items
+        assert get_cost('(pagination: {limit: 0})') == 3
+
+    @override_settings(GRAPHQL_USER_COST_BUDGET=20)
+    def test_user_cost_budget(self):
+        for _ in range(3):
+            self.query_check(self.QUERY, variables={'limit': 10})
+        content = self.query_check(self.QUERY, variables={'limit': 10}, assert_errors=True)
+        assert content['errors'][0]['extensions']['code'] == 'USER_COST_LIMIT_EXCEEDED'
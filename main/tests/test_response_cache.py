@@ -0,0 +1,53 @@
+from django.test import override_settings
+
+from main.tests import TestCase
+from main.graphql.response_cache import ResponseCache
+
+from apps.user.factories import UserFactory
+
+
+@override_settings(GRAPHQL_RESPONSE_CACHE=True)
+class TestResponseCache(TestCase):
+    QUERY = '''
+        query MyQuery {
+          enums {
+            GlobalPermissionType {
+              key
+              label
+            }
+          }
+        }
+    '''
+
+    def test_response_cache(self):
+        content = self.query_check(self.QUERY)
+        for _ in range(2):
+            assert self.query_check(self.QUERY) == content
+        assert ResponseCache.cache.stats.as_dict() == {
+            'local_hits': 2,
+            'hits': 0,
+            'misses': 1,
+            'hit_ratio': 2 / 3,
+        }
+
+        # Redis
+        ResponseCache.cache.local_cache.clear()
+        assert self.query_check(self.QUERY) == content
+        assert ResponseCache.cache.stats.hits == 1
+
+        # Invalidated using the tags
+        ResponseCache.invalidate_tags('enums')
+        assert self.query_check(self.QUERY) == content
+        assert ResponseCache.cache.stats.misses == 2
+
+        # Not cached: Not cacheable fields
+        self.query_check('query MyQuery { public { me { id } } }')
+        assert ResponseCache.cache.stats.misses == 2
+
+        # Not cached: Authenticated users
+        ResponseCache.cache.clear_local()
+        self.force_login(UserFactory.create())
+        for _ in range(2):
+            assert self.query_check(self.QUERY) == content
+        assert ResponseCache.cache.stats.as_dict()['hit_ratio'] == 0
+        assert ResponseCache.cache.stats.misses == 0
@@ -0,0 +1,44 @@
+from django.test import override_settings
+
+from main.tests import TestCase
+
+from apps.user.factories import UserFactory
+
+
+class TestTimingExtension(TestCase):
+    QUERY = '''
+        query MyQuery {
+          private {
+            users(order: {id: ASC}, pagination: {limit: 10, offset: 0}) {
+              count
+              items {
+                id
+                displayName
+              }
+            }
+          }
+        }
+    '''
+
+    def test_timing_in_response(self):
+        user = UserFactory.create()
+        UserFactory.create_batch(2)
+        self.force_login(user)
+
+        # Disabled by default
+        content = self.query_check(self.QUERY)
+        assert 'timing' not in content.get('extensions', {})
+
+        with override_settings(GRAPHQL_TIMING_IN_RESPONSE=True):
+            content = self.query_check(self.QUERY)
+        timing = content['extensions']['timing']
+        resolvers = timing['resolvers']
+        assert resolvers['private.users.items[].id']['calls'] == 3
+        assert resolvers['private.users.items[].displayName']['calls'] == 3
+        # Page and count are fetched using a single query (window count)
+        assert timing['sql_queries'] == 1
+        assert sum(
+            stats['sql_queries']
+            for path, stats in resolvers.items()
+            if path.startswith('private.users')
+        ) == 1
@@ -1,4 +1,4 @@
-from django.db import connection
+from django.db import connection, models
 
 
 def execute_raw_query(query, params={}, flat=False):
@@ -11,3 +11,56 @@ def execute_raw_query(query, params={}, flat=False):
             for row in rows
         ]
     return rows
+
+
+def get_estimated_count(queryset: models.QuerySet) -> int | None:
+    """
+    Row count estimated by the postgres planner (rows are not scanned)
+    - Unfiltered queryset: pg_class.reltuples (Updated by VACUUM/ANALYZE)
+    - Filtered queryset: EXPLAIN row estimate
+    """
+    if not queryset.query.where:
+        estimates = execute_raw_query(
+            'SELECT reltuples::bigint FROM pg_class WHERE oid = %(table)s::regclass',
+            {'table': queryset.model._meta.db_table},
+            flat=True,
+        )
+    else:
+        sql, params = queryset.order_by().query.sql_with_params()
+        plans = execute_raw_query(f'EXPLAIN (FORMAT JSON) {sql}', params, flat=True)
+        estimates = [
+            plan[0]['Plan']['Plan Rows']
+            for plan in plans
+        ]
+    # reltuples is -1 for tables which are not analyzed yet
+    if estimates and estimates[0] >= 0:
+        return int(estimates[0])
+
+
+class ImmutableConcat(models.Func):
+    """
+    Concat using ||, unlike CONCAT() this is immutable and can be used in index expressions
+    NOTE: NULL values are not ignored, use it with non-nullable fields only
+    """
+    arg_joiner = ' || '
+    template = '(%(expressions)s)'
+    output_field = models.TextField()
+
+
+def exclude_related(queryset: models.QuerySet, relation: str, **filters) -> models.QuerySet:
+    """
+    Same as queryset.exclude(**{f'{relation}__{key}': value}).distinct() using a NOT EXISTS (anti-join)
+    Rows are not duplicated by the join, so DISTINCT is not required (Keeps the count/pagination plans simple)
+    - relation: Reverse relation (ForeignKey/ManyToMany) or forward ManyToMany field name
+    """
+    field = queryset.model._meta.get_field(relation)
+    if field.auto_created and not field.concrete:
+        # Reverse relation
+        outer_filter = {field.field.name: models.OuterRef('pk')}
+    else:
+        outer_filter = {field.related_query_name(): models.OuterRef('pk')}
+    return queryset.filter(
+        ~models.Exists(
+            field.related_model.objects.filter(**outer_filter, **filters)
+        )
+    )
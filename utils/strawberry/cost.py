@@ -0,0 +1,158 @@
+import enum
+import typing
+
+from django.conf import settings
+from graphql import (
+    DocumentNode,
+    FieldNode,
+    FragmentDefinitionNode,
+    FragmentSpreadNode,
+    GraphQLField,
+    GraphQLObjectType,
+    InlineFragmentNode,
+    OperationDefinitionNode,
+    SelectionSetNode,
+    get_named_type,
+    get_nullable_type,
+    is_leaf_type,
+    is_list_type,
+    value_from_ast_untyped,
+)
+from graphql.type.schema import GraphQLSchema
+from strawberry.schema.schema_converter import GraphQLCoreConverter
+
+FIELD_COST_ATTRIBUTE = '_field_cost'
+PAGINATION_ARGUMENT = 'pagination'
+
+
+class FieldCost(str, enum.Enum):
+    # Weights are defined in settings.GRAPHQL_COST_WEIGHTS
+    SCALAR = 'scalar'
+    OBJECT = 'object'
+    DATALOADER = 'dataloader'
+    RESOLVER = 'resolver'
+
+
+def field_cost(cost: FieldCost):
+    """
+    Declare the cost type of a custom resolver, used by the operation cost analysis
+    Usage:
+        @strawberry.field
+        @field_cost(FieldCost.DATALOADER)
+        def created_by(self, info: Info) -> UserType:
+            return info.context.dl.user.load_users.load(self.created_by_id)
+    """
+    def _wrapper(func):
+        setattr(func, FIELD_COST_ATTRIBUTE, cost)
+        return func
+    return _wrapper
+
+
+def get_field_weight(field: GraphQLField) -> float:
+    weights = settings.GRAPHQL_COST_WEIGHTS
+    strawberry_field = (field.extensions or {}).get(GraphQLCoreConverter.DEFINITION_BACKREF)
+    base_resolver = getattr(strawberry_field, 'base_resolver', None)
+    if base_resolver is not None:
+        if cost := getattr(base_resolver.wrapped_func, FIELD_COST_ATTRIBUTE, None):
+            return weights[cost]
+    if is_leaf_type(get_named_type(field.type)):
+        return weights[FieldCost.SCALAR]
+    return weights[FieldCost.OBJECT]
+
+
+def get_pagination_limit(field: GraphQLField, node: FieldNode, variables: dict | None) -> int | None:
+    # Same as utils.strawberry.paginations.process_pagination (Default limit is used without the argument)
+    if PAGINATION_ARGUMENT not in field.args:
+        return None
+    pagination = None
+    for argument in node.arguments or []:
+        if argument.name.value == PAGINATION_ARGUMENT:
+            pagination = value_from_ast_untyped(argument.value, variables)
+    limit = (pagination or {}).get('limit', -1)
+    if limit is None or limit == -1:
+        limit = settings.DEFAULT_PAGINATION_LIMIT
+    return min(limit, settings.MAX_PAGINATION_LIMIT)
+
+
+def iter_field_nodes(
+    selection_set: SelectionSetNode,
+    fragments: dict[str, FragmentDefinitionNode],
+    visited_fragments: frozenset = frozenset(),
+) -> typing.Iterator[FieldNode]:
+    """
+    Fields of the selection set, including the fields from the fragments
+    """
+    for selection in selection_set.selections:
+        if isinstance(selection, FieldNode):
+            yield selection
+        elif isinstance(selection, InlineFragmentNode):
+            yield from iter_field_nodes(selection.selection_set, fragments, visited_fragments)
+        elif isinstance(selection, FragmentSpreadNode):
+            name = selection.name.value
+            if name in visited_fragments or name not in fragments:
+                continue
+            yield from iter_field_nodes(fragments[name].selection_set, fragments, visited_fragments | {name})
+
+
+def get_fragments(document: DocumentNode) -> dict[str, FragmentDefinitionNode]:
+    return {
+        definition.name.value: definition
+        for definition in document.definitions
+        if isinstance(definition, FragmentDefinitionNode)
+    }
+
+
+class OperationCost:
+    """
+    Estimated cost of the operation, calculated using the document before execution
+    - Each field adds its weight (settings.GRAPHQL_COST_WEIGHTS) multiplied by the number of times it's resolved
+    - Lists under a paginated field are resolved `limit` times, other lists GRAPHQL_COST_DEFAULT_LIST_SIZE times
+    """
+
+    def __init__(
+        self,
+        schema: GraphQLSchema,
+        operation: OperationDefinitionNode,
+        fragments: dict[str, FragmentDefinitionNode],
+        variables: dict | None,
+    ):
+        self.schema = schema
+        self.operation = operation
+        self.fragments = fragments
+        self.variables = variables
+
+    def get_cost(self) -> float:
+        root_type = self.schema.get_root_type(self.operation.operation)
+        if root_type is None:
+            return 0
+        return self._get_selection_set_cost(root_type, self.operation.selection_set, 1, None)
+
+    def _get_selection_set_cost(
+        self,
+        parent_type,
+        selection_set: SelectionSetNode | None,
+        multiplier: float,
+        page_size: int | None,
+    ) -> float:
+        if selection_set is None or not isinstance(parent_type, GraphQLObjectType):
+            # NOTE: Interfaces/Unions are not used by the schema (yet), counted as 0
+            return 0
+        cost = 0
+        for node in iter_field_nodes(selection_set, self.fragments):
+            name = node.name.value
+            if name.startswith('__'):
+                continue
+            field = parent_type.fields.get(name)
+            if field is None:
+                continue
+            cost += multiplier * get_field_weight(field)
+            field_multiplier = multiplier
+            if is_list_type(get_nullable_type(field.type)):
+                field_multiplier *= settings.GRAPHQL_COST_DEFAULT_LIST_SIZE if page_size is None else page_size
+            cost += self._get_selection_set_cost(
+                get_named_type(field.type),
+                node.selection_set,
+                field_multiplier,
+                get_pagination_limit(field, node, self.variables),
+            )
+        return cost
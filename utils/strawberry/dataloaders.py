@@ -0,0 +1,43 @@
+import dataclasses
+
+from strawberry.dataloader import DataLoader
+
+
+@dataclasses.dataclass
+class DataLoaderStats:
+    loads: int = 0
+    batches: int = 0
+    batch_keys: int = 0
+    max_batch_size: int = 0
+
+    @property
+    def hits(self) -> int:
+        # Loads resolved using the request cache (Not send to load_fn)
+        return self.loads - self.batch_keys
+
+    def as_dict(self) -> dict:
+        return {
+            **dataclasses.asdict(self),
+            'hits': self.hits,
+        }
+
+
+class InstrumentedDataLoader(DataLoader):
+    """
+    DataLoader with load/batch counters, used to catch N+1 regressions
+    """
+
+    def __init__(self, load_fn, **kwargs):
+        self.stats = DataLoaderStats()
+
+        async def _load_fn(keys):
+            self.stats.batches += 1
+            self.stats.batch_keys += len(keys)
+            self.stats.max_batch_size = max(self.stats.max_batch_size, len(keys))
+            return await load_fn(keys)
+
+        super().__init__(load_fn=_load_fn, **kwargs)
+
+    def load(self, key):
+        self.stats.loads += 1
+        return super().load(key)
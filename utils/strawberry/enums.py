@@ -10,6 +10,8 @@ from rest_framework import serializers
 
 from utils.common import to_camel_case
 
+from .fields import requires_fields
+
 
 def get_enum_name_from_django_field(
     field: None | DjangoBaseField,
@@ -77,12 +79,14 @@ def enum_display_field(field) -> typing.Callable[..., str]:
     if is_array := isinstance(_field, ArrayField):
         _field = _field.base_field
 
+    # Built once per field (Labels are resolved per language using force_str)
+    choices_dict = dict(make_hashable(_field.flatchoices))
+
     def _get_value(root) -> None | str | list[str]:
         # https://github.com/django/django/blob/stable/4.2.x/django/db/models/base.py#L1144-L1150
         value = getattr(root, _field.attname)
         if value is None:
             return
-        choices_dict = dict(make_hashable(_field.flatchoices))
         # force_str() to coerce lazy strings.
         if is_array:
             return [
@@ -96,6 +100,7 @@ def enum_display_field(field) -> typing.Callable[..., str]:
         )
 
     @strawberry.field
+    @requires_fields(_field.attname)
     def array_field_(root) -> list[str]:
         return _get_value(root)
 
@@ -103,10 +108,12 @@ def enum_display_field(field) -> typing.Callable[..., str]:
         return array_field_
 
     @strawberry.field
+    @requires_fields(_field.attname)
     def field_(root) -> str:
         return _get_value(root)
 
     @strawberry.field
+    @requires_fields(_field.attname)
     def nullable_field_(root) -> typing.Optional[str]:
         return _get_value(root)
 
@@ -140,6 +147,7 @@ def enum_field(field):
         return FieldEnum(value)
 
     @strawberry.field
+    @requires_fields(_field.attname)
     def array_field_(root) -> list[FieldEnum]:
         return _get_value(root)
 
@@ -147,10 +155,12 @@ def enum_field(field):
         return array_field_
 
     @strawberry.field
+    @requires_fields(_field.attname)
     def field_(root) -> FieldEnum:
         return _get_value(root)
 
     @strawberry.field
+    @requires_fields(_field.attname)
     def nullable_field_(root) -> typing.Optional[FieldEnum]:
         return _get_value(root)
 
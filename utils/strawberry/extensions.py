@@ -0,0 +1,378 @@
+import contextvars
+import dataclasses
+import datetime
+import hashlib
+import inspect
+import math
+import random
+import threading
+import time
+import typing
+
+import sentry_sdk
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections
+from django.db.backends.signals import connection_created
+from graphql import ExecutionResult as GraphQLExecutionResult, GraphQLError, get_operation_ast
+from strawberry.extensions import SchemaExtension
+from strawberry.schema.execute import parse_document
+
+from main.caches import CacheKey, LocalTTLCache
+
+from .cost import OperationCost, get_fragments
+
+
+@dataclasses.dataclass
+class DocumentCacheStats:
+    parse_hits: int = 0
+    parse_misses: int = 0
+    validation_hits: int = 0
+    validation_misses: int = 0
+
+    def as_dict(self) -> dict:
+        return dataclasses.asdict(self)
+
+
+class DocumentCache:
+    """
+    Process level LRU for parsed documents and their validation result
+    - Keyed by the schema, the query hash and the validation rules (Schema reload uses new keys)
+    """
+    cache = LocalTTLCache(
+        maxsize=settings.GRAPHQL_DOCUMENT_CACHE_MAXSIZE,
+        ttl=settings.GRAPHQL_DOCUMENT_CACHE_TTL,
+    )
+    stats = DocumentCacheStats()
+
+    @staticmethod
+    def get_document_key(schema, query: str) -> tuple:
+        return (
+            id(schema),
+            hashlib.sha256(query.encode()).hexdigest(),
+        )
+
+    @classmethod
+    def get_validation_key(cls, document_key: tuple, validation_rules: tuple) -> tuple:
+        return (*document_key, validation_rules)
+
+    @classmethod
+    def clear(cls):
+        cls.cache.clear()
+        cls.stats = DocumentCacheStats()
+
+
+class DocumentCacheExtension(SchemaExtension):
+    """
+    Skip parse and validation for already seen documents
+    NOTE: Pass the class (not an instance) to the schema, the document key is stored per execution
+    """
+
+    document_key: tuple | None = None
+
+    def on_parse(self):
+        execution_context = self.execution_context
+        if execution_context.query is not None and execution_context.graphql_document is None:
+            self.document_key = DocumentCache.get_document_key(
+                execution_context.schema,
+                execution_context.query,
+            )
+            document = DocumentCache.cache.get(self.document_key)
+            if document is None:
+                DocumentCache.stats.parse_misses += 1
+                try:
+                    document = parse_document(execution_context.query, **execution_context.parse_options)
+                except GraphQLError:
+                    # Let strawberry handle/report the syntax error
+                    self.document_key = None
+                else:
+                    DocumentCache.cache.set(self.document_key, document)
+            else:
+                DocumentCache.stats.parse_hits += 1
+            execution_context.graphql_document = document
+        yield
+
+    def on_validate(self):
+        execution_context = self.execution_context
+        if self.document_key is None or execution_context.errors is not None:
+            yield
+            return
+
+        validation_key = DocumentCache.get_validation_key(
+            self.document_key,
+            tuple(execution_context.validation_rules),
+        )
+        errors: typing.Optional[list[GraphQLError]] = DocumentCache.cache.get(validation_key)
+        if errors is not None:
+            DocumentCache.stats.validation_hits += 1
+            # Strawberry skips validation if errors is already set
+            execution_context.errors = errors
+            yield
+            return
+
+        DocumentCache.stats.validation_misses += 1
+        yield
+        DocumentCache.cache.set(validation_key, execution_context.errors or [])
+
+
+@dataclasses.dataclass
+class ResolverStats:
+    calls: int = 0
+    duration: float = 0
+    sql_queries: int = 0
+    sql_duration: float = 0
+    first_start: float | None = None
+    last_end: float = 0
+
+    def as_dict(self) -> dict:
+        return {
+            'calls': self.calls,
+            'ms': round(self.duration * 1000, 2),
+            'sql_queries': self.sql_queries,
+            'sql_ms': round(self.sql_duration * 1000, 2),
+        }
+
+
+class TimingRecorder:
+    """
+    Per operation resolver/SQL timing, resolvers of list items are aggregated (eg: private.users.items[].id)
+    NOTE: Sync resolvers record from the executor threads
+    """
+
+    OPERATION_PATH = ''
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.start_datetime = datetime.datetime.now(datetime.timezone.utc)
+        self.paths: dict[str, ResolverStats] = {}
+        self._lock = threading.Lock()
+
+    def _get_stats(self, path: str) -> ResolverStats:
+        if (stats := self.paths.get(path)) is None:
+            stats = self.paths[path] = ResolverStats()
+        return stats
+
+    def add_resolver(self, path: str, start: float, end: float):
+        with self._lock:
+            stats = self._get_stats(path)
+            stats.calls += 1
+            stats.duration += end - start
+            if stats.first_start is None:
+                stats.first_start = start
+            stats.last_end = max(stats.last_end, end)
+
+    def add_sql(self, path: str, duration: float):
+        with self._lock:
+            stats = self._get_stats(path)
+            stats.sql_queries += 1
+            stats.sql_duration += duration
+
+    def get_datetime(self, perf_counter_value: float) -> datetime.datetime:
+        return self.start_datetime + datetime.timedelta(seconds=perf_counter_value - self.start)
+
+    def as_dict(self) -> dict:
+        with self._lock:
+            paths = dict(self.paths)
+        return {
+            'ms': round((time.perf_counter() - self.start) * 1000, 2),
+            'sql_queries': sum(stats.sql_queries for stats in paths.values()),
+            'sql_ms': round(sum(stats.sql_duration for stats in paths.values()) * 1000, 2),
+            'resolvers': {
+                path or 'operation': stats.as_dict()
+                for path, stats in paths.items()
+            },
+        }
+
+
+# (TimingRecorder, resolver path) for the current resolver/operation
+current_timing_recorder: contextvars.ContextVar[tuple[TimingRecorder, str] | None] = contextvars.ContextVar(
+    'current_timing_recorder',
+    default=None,
+)
+
+
+def record_sql(execute, sql, params, many, context):
+    if (current := current_timing_recorder.get()) is None:
+        return execute(sql, params, many, context)
+    recorder, path = current
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        recorder.add_sql(path, time.perf_counter() - start)
+
+
+def install_sql_recorder(connection, **_):
+    if record_sql not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_sql)
+
+
+connection_created.connect(install_sql_recorder, dispatch_uid='graphql-timing-sql-recorder')
+# Connections opened before this module is loaded (eg: persistent connections, tests)
+for _connection in connections.all(initialized_only=True):
+    install_sql_recorder(_connection)
+
+
+def get_resolver_path(info) -> str:
+    path = ''
+    for key in info.path.as_list():
+        if isinstance(key, int):
+            path += '[]'
+        else:
+            path = f'{path}.{key}' if path else key
+    return path
+
+
+class TimingExtension(SchemaExtension):
+    """
+    Resolver wall time, SQL queries/time attributed to the resolvers and dataloader batch sizes
+    - Sampled using GRAPHQL_TIMING_SAMPLE_RATE
+    - Sent to sentry as spans (Resolvers slower than GRAPHQL_TIMING_SPAN_MIN_MS or with SQL queries)
+    - Returned as extensions.timing if DEBUG and GRAPHQL_TIMING_IN_RESPONSE
+    NOTE: Pass the class (not an instance) to the schema, the recorder is stored per execution
+    """
+
+    recorder: TimingRecorder | None = None
+
+    @staticmethod
+    def in_response() -> bool:
+        return settings.DEBUG and settings.GRAPHQL_TIMING_IN_RESPONSE
+
+    def on_operation(self):
+        if not (self.in_response() or random.random() < settings.GRAPHQL_TIMING_SAMPLE_RATE):
+            yield
+            return
+        self.recorder = TimingRecorder()
+        token = current_timing_recorder.set((self.recorder, TimingRecorder.OPERATION_PATH))
+        try:
+            yield
+        finally:
+            current_timing_recorder.reset(token)
+        self.send_to_sentry()
+
+    def resolve(self, _next, root, info, *args, **kwargs):
+        if self.recorder is None or info.field_name.startswith('__'):
+            return _next(root, info, *args, **kwargs)
+
+        path = get_resolver_path(info)
+        start = time.perf_counter()
+        token = current_timing_recorder.set((self.recorder, path))
+        try:
+            result = _next(root, info, *args, **kwargs)
+        finally:
+            current_timing_recorder.reset(token)
+        if inspect.isawaitable(result):
+            return self._await_resolver(result, path, start)
+        self.recorder.add_resolver(path, start, time.perf_counter())
+        return result
+
+    async def _await_resolver(self, result, path: str, start: float):
+        assert self.recorder is not None
+        token = current_timing_recorder.set((self.recorder, path))
+        try:
+            return await result
+        finally:
+            current_timing_recorder.reset(token)
+            self.recorder.add_resolver(path, start, time.perf_counter())
+
+    def get_dataloader_stats(self) -> dict:
+        dl = getattr(self.execution_context.context, 'dl', None)
+        if dl is None:
+            return {}
+        return {
+            name: stats.as_dict()
+            for name, stats in dl.get_stats().items()
+        }
+
+    def send_to_sentry(self):
+        if not settings.SENTRY_ENABLED or self.recorder is None:
+            return
+        span = sentry_sdk.Hub.current.scope.span
+        if span is None:
+            return
+        span.set_data('graphql.dataloaders', self.get_dataloader_stats())
+        min_duration = settings.GRAPHQL_TIMING_SPAN_MIN_MS / 1000
+        for path, stats in self.recorder.paths.items():
+            if not path or stats.first_start is None:
+                continue
+            if stats.duration < min_duration and not stats.sql_queries:
+                continue
+            child_span = span.start_child(
+                op='graphql.resolve',
+                description=path,
+                start_timestamp=self.recorder.get_datetime(stats.first_start),
+            )
+            for key, value in stats.as_dict().items():
+                child_span.set_data(key, value)
+            child_span.finish(end_timestamp=self.recorder.get_datetime(stats.last_end))
+
+    def get_results(self):
+        if self.recorder is None or not self.in_response():
+            return {}
+        return {
+            'timing': {
+                **self.recorder.as_dict(),
+                'dataloaders': self.get_dataloader_stats(),
+            },
+        }
+
+
+class QueryCostExtension(SchemaExtension):
+    """
+    Reject expensive operations before execution (Check utils.strawberry.cost.OperationCost)
+    - Per operation: GRAPHQL_MAX_OPERATION_COST
+    - Per user (or IP for anonymous users): GRAPHQL_USER_COST_BUDGET per GRAPHQL_USER_COST_BUDGET_WINDOW seconds
+    """
+
+    def get_budget_cache_key(self) -> str:
+        context = self.execution_context.context
+        user = getattr(context, 'user', None)
+        if user is not None and user.is_authenticated:
+            identifier = f'user-{user.pk}'
+        else:
+            identifier = f"ip-{context.request.META.get('REMOTE_ADDR')}"
+        return CacheKey.GRAPHQL_USER_COST_BUDGET_KEY_FORMAT.format(identifier)
+
+    def get_used_budget(self, cost: int) -> int:
+        cache_key = self.get_budget_cache_key()
+        cache.add(cache_key, 0, settings.GRAPHQL_USER_COST_BUDGET_WINDOW)
+        try:
+            return cache.incr(cache_key, cost)
+        except ValueError:
+            # Expired in between
+            cache.set(cache_key, cost, settings.GRAPHQL_USER_COST_BUDGET_WINDOW)
+            return cost
+
+    def get_cost_error(self) -> GraphQLError | None:
+        execution_context = self.execution_context
+        document = execution_context.graphql_document
+        if document is None:
+            return None
+        operation = get_operation_ast(document, execution_context.operation_name)
+        if operation is None:
+            return None
+        cost = math.ceil(
+            OperationCost(
+                execution_context.schema._schema,
+                operation,
+                get_fragments(document),
+                execution_context.variables,
+            ).get_cost()
+        )
+        if cost > settings.GRAPHQL_MAX_OPERATION_COST:
+            return GraphQLError(
+                f'Operation is too expensive: cost {cost} > {settings.GRAPHQL_MAX_OPERATION_COST}',
+                extensions={'code': 'OPERATION_COST_LIMIT_EXCEEDED', 'cost': cost},
+            )
+        if settings.GRAPHQL_USER_COST_BUDGET and self.get_used_budget(cost) > settings.GRAPHQL_USER_COST_BUDGET:
+            return GraphQLError(
+                'Operation cost budget exceeded, please try again later',
+                extensions={'code': 'USER_COST_LIMIT_EXCEEDED', 'cost': cost},
+            )
+
+    def on_execute(self):
+        # NOTE: Result can be already provided by other extensions (eg: cached response)
+        if self.execution_context.result is None and (error := self.get_cost_error()):
+            # Strawberry skips the execution if result is already set
+            self.execution_context.result = GraphQLExecutionResult(data=None, errors=[error])
+        yield
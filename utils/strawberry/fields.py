@@ -0,0 +1,123 @@
+import typing
+
+from django.core.exceptions import FieldDoesNotExist
+from django.db import models
+from strawberry import UNSET
+from strawberry.types.nodes import SelectedField, Selection
+from strawberry_django import utils
+from strawberry_django.fields.field import StrawberryDjangoField
+from strawberry_django.resolvers import django_resolver
+
+from utils.common import to_camel_case
+
+ONLY_FIELDS_ATTRIBUTE = '_only_fields'
+
+
+def requires_fields(*fields: str):
+    """
+    Declare the model fields used by a custom resolver, used to build .only()
+    Usage:
+        @strawberry.field
+        @requires_fields('first_name', 'last_name')
+        def display_name(self) -> str:
+            return self.get_full_name()
+    """
+    def _wrapper(func):
+        setattr(func, ONLY_FIELDS_ATTRIBUTE, fields)
+        return func
+    return _wrapper
+
+
+def iter_selected_fields(selections: list[Selection]) -> typing.Iterator[SelectedField]:
+    for selection in selections:
+        if isinstance(selection, SelectedField):
+            yield selection
+        else:
+            # Fragments
+            yield from iter_selected_fields(selection.selections)
+
+
+def get_sub_selections(selections: list[Selection], name: str) -> list[Selection]:
+    return [
+        sub_selection
+        for selected_field in iter_selected_fields(selections)
+        if selected_field.name == name
+        for sub_selection in selected_field.selections
+    ]
+
+
+def get_only_fields(type_, selections: list[Selection]) -> set[str] | None:
+    """
+    Model fields required to resolve the selections using the given strawberry_django type
+    Returns None if this can't be figured out (all columns should be loaded)
+    """
+    model = utils.get_django_model(type_)
+    type_fields = {
+        field.graphql_name or to_camel_case(field.python_name): field
+        for field in type_._type_definition.fields
+    }
+    only_fields = {model._meta.pk.name}
+    for selected_field in iter_selected_fields(selections):
+        if selected_field.name.startswith('__'):
+            continue
+        field = type_fields.get(selected_field.name)
+        if field is None:
+            return None
+        if field.base_resolver is not None:
+            resolver_only_fields = getattr(field.base_resolver.wrapped_func, ONLY_FIELDS_ATTRIBUTE, None)
+            if resolver_only_fields is None:
+                return None
+            only_fields.update(resolver_only_fields)
+            continue
+        try:
+            model_field = model._meta.get_field(getattr(field, 'django_name', None) or field.python_name)
+        except FieldDoesNotExist:
+            return None
+        # Reverse relations and M2M don't use any column of this model
+        if model_field.concrete:
+            only_fields.add(model_field.attname)
+    return only_fields
+
+
+def apply_only_fields(
+    queryset: models.QuerySet,
+    type_,
+    selections: list[Selection],
+    extra_fields: typing.Iterable[str] = (),
+) -> models.QuerySet:
+    only_fields = get_only_fields(type_, selections)
+    if only_fields is None:
+        return queryset
+    return queryset.only(*only_fields, *extra_fields)
+
+
+class StrawberryDjangoProjectedField(StrawberryDjangoField):
+    """
+    Only load the columns required by the selection set
+    """
+
+    def get_queryset(self, queryset, info, **kwargs):
+        queryset = super().get_queryset(queryset, info, **kwargs)
+        return apply_only_fields(
+            queryset,
+            utils.unwrap_type(self.type),
+            info.selected_fields[0].selections,
+        )
+
+
+def projected_field(
+    resolver=None, *, name=None, field_name=None, filters=UNSET, default=UNSET, **kwargs
+) -> typing.Any:
+    field_ = StrawberryDjangoProjectedField(
+        python_name=None,
+        graphql_name=name,
+        type_annotation=None,
+        filters=filters,
+        django_name=field_name,
+        default=default,
+        **kwargs,
+    )
+    if resolver:
+        resolver = django_resolver(resolver)
+        return field_(resolver)
+    return field_
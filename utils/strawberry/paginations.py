@@ -1,14 +1,22 @@
 from __future__ import annotations
 
-import copy
+import asyncio
+import base64
+import enum
+import functools
+import json
 from typing import Any, Generic, TypeVar, Callable, Type
 
 import strawberry
 from asgiref.sync import sync_to_async
 from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
 from django.db import models
+from django.db.models.signals import post_save, post_delete
 from strawberry_django import utils
+from strawberry_django.arguments import argument
 from strawberry_django.fields.field import StrawberryDjangoField
+from strawberry_django.ordering import generate_order_args
 from strawberry_django.pagination import (
     OffsetPaginationInput,
     StrawberryDjangoPagination,
@@ -16,6 +24,17 @@ from strawberry_django.pagination import (
 
 from strawberry_django.resolvers import django_resolver
 
+from main.caches import CacheKey, TwoTierCache
+from utils.db import get_estimated_count
+
+from .fields import apply_only_fields, get_sub_selections
+
+
+def process_pagination_limit(limit: int) -> int:
+    if limit == -1:
+        limit = settings.DEFAULT_PAGINATION_LIMIT
+    return min(limit, settings.MAX_PAGINATION_LIMIT)
+
 
 def process_pagination(pagination):
     """
@@ -26,9 +45,7 @@ def process_pagination(pagination):
             offset=0,
             limit=settings.DEFAULT_PAGINATION_LIMIT,
         )
-    if pagination.limit == -1:
-        pagination.limit = settings.DEFAULT_PAGINATION_LIMIT
-    pagination.limit = min(pagination.limit, settings.MAX_PAGINATION_LIMIT)
+    pagination.limit = process_pagination_limit(pagination.limit)
     return pagination
 
 
@@ -61,20 +78,160 @@ OffsetPaginationInput.limit = 1  # TODO: This is not working
 DjangoModelTypeVar = TypeVar("DjangoModelTypeVar")
 
 
+class CountStrategy(enum.Enum):
+    EXACT = 'exact'
+    # Postgres planner estimate is used if it is over PAGINATION_ESTIMATED_COUNT_THRESHOLD
+    ESTIMATED = 'estimated'
+    # Exact count cached in redis, invalidated when the model is saved/deleted
+    # NOTE: The model needs to be registered using register_count_invalidation
+    CACHED = 'cached'
+
+
+# Models with the cached counts (Check register_count_invalidation)
+COUNT_CACHE_MODELS: set[Type[models.Model]] = set()
+
+
+@functools.cache
+def get_count_cache(model: Type[models.Model]) -> TwoTierCache[str, int]:
+    # NOTE: No local cache, the counts are invalidated using the namespace version
+    return TwoTierCache(
+        CacheKey.PAGINATION_COUNT_NAMESPACE_FORMAT.format(model=model._meta.label_lower),
+        timeout=settings.PAGINATION_COUNT_CACHE_TTL,
+        versioned=True,
+        hash_keys=True,
+        # NOTE: Not single-flight, waiting for the other process blocks the shared sync_to_async thread
+    )
+
+
+def get_cached_count(queryset: models.QuerySet) -> int:
+    assert queryset.model in COUNT_CACHE_MODELS, (
+        f'{queryset.model._meta.label} should be registered using register_count_invalidation'
+    )
+    # NOTE: SQL includes filter and order
+    sql, params = queryset.query.sql_with_params()
+    return get_count_cache(queryset.model).get_or_set(f'{sql}-{params}', queryset.count)
+
+
+def invalidate_cached_count(sender: Type[models.Model], **_):
+    get_count_cache(sender).invalidate()
+
+
+def register_count_invalidation(model: Type[models.Model]):
+    """
+    Required for CountStrategy.CACHED/get_cached_count, call from the AppConfig.ready of the model's app
+    NOTE: Only saves/deletes using the model are tracked,
+    PAGINATION_COUNT_CACHE_TTL bounds the staleness for the others (eg: bulk operations, raw SQL)
+    """
+    COUNT_CACHE_MODELS.add(model)
+    for signal in [post_save, post_delete]:
+        signal.connect(
+            invalidate_cached_count,
+            sender=model,
+            dispatch_uid=f'pagination-count-cache-{model._meta.label_lower}',
+        )
+
+
+class QuerysetCount:
+    """
+    Count the queryset once using the given strategy
+    """
+
+    def __init__(self, queryset: models.QuerySet, strategy: CountStrategy):
+        self.queryset = queryset
+        self.strategy = strategy
+        self._count = None
+        self._is_exact = True
+        self._lock = asyncio.Lock()
+
+    async def _get_count(self) -> tuple[int, bool]:
+        if self.strategy == CountStrategy.ESTIMATED:
+            # Raw cursor, no async support
+            estimated_count = await sync_to_async(get_estimated_count)(self.queryset)
+            if (
+                estimated_count is not None and
+                estimated_count >= settings.PAGINATION_ESTIMATED_COUNT_THRESHOLD
+            ):
+                return estimated_count, False
+        elif self.strategy == CountStrategy.CACHED:
+            return await sync_to_async(get_cached_count)(self.queryset), True
+        return await self.queryset.acount(), True
+
+    async def get_count(self) -> int:
+        async with self._lock:
+            if self._count is None:
+                self._count, self._is_exact = await self._get_count()
+        return self._count
+
+    async def get_is_exact(self) -> bool:
+        await self.get_count()
+        return self._is_exact
+
+
+WINDOW_COUNT_ANNOTATION = '_window_total_count'
+
+
+class WindowCountPage:
+    """
+    Fetch a page and the total count of the (unpaginated) queryset using a single query.
+    COUNT(*) OVER () is evaluated before LIMIT/OFFSET, so every row of the page carries the total.
+    """
+
+    def __init__(self, queryset: models.QuerySet, count_queryset: models.QuerySet, offset: int):
+        self.queryset = queryset
+        self.count_queryset = count_queryset
+        self.offset = offset
+        self._items = None
+        self._lock = asyncio.Lock()
+
+    @staticmethod
+    def annotate(queryset: models.QuerySet) -> models.QuerySet:
+        return queryset.annotate(**{
+            WINDOW_COUNT_ANNOTATION: models.Window(models.Count('*')),
+        })
+
+    async def get_items(self) -> list:
+        # count and items are resolved concurrently, make sure the query runs only once
+        async with self._lock:
+            if self._items is None:
+                self._items = [
+                    d
+                    async for d in self.queryset
+                ]
+        return self._items
+
+    async def get_count(self) -> int:
+        items = await self.get_items()
+        if items:
+            return getattr(items[0], WINDOW_COUNT_ANNOTATION)
+        if self.offset == 0:
+            return 0
+        # Offset is beyond the last row, window count is not available
+        return await self.count_queryset.acount()
+
+
 @strawberry.type
 class CountList(Generic[DjangoModelTypeVar]):
     limit: int
     offset: int
     queryset: strawberry.Private[models.QuerySet | list[DjangoModelTypeVar]]
     get_count: strawberry.Private[Callable]
+    get_items: strawberry.Private[Callable | None] = None
+    get_count_is_exact: strawberry.Private[Callable | None] = None
 
     @strawberry.field
     async def count(self) -> int:
         return await self.get_count()
 
+    @strawberry.field
+    async def count_is_exact(self) -> bool:
+        if self.get_count_is_exact is None:
+            return True
+        return await self.get_count_is_exact()
+
     @strawberry.field
     async def items(self) -> list[DjangoModelTypeVar]:
-        # queryset = self.queryset
+        if self.get_items is not None:
+            return await self.get_items()
         queryset = self.queryset
         if type(self.queryset) in [list, tuple]:
             return queryset
@@ -85,6 +242,22 @@ class CountList(Generic[DjangoModelTypeVar]):
 
 
 class StrawberryDjangoCountList(StrawberryDjangoField):
+    def __init__(
+        self,
+        *args,
+        window_count: bool = False,
+        count_strategy: CountStrategy = CountStrategy.EXACT,
+        **kwargs,
+    ):
+        """
+        window_count: Fetch items and count using a single query (COUNT(*) OVER ())
+            Only used with CountStrategy.EXACT
+        count_strategy: How count is calculated (Check CountStrategy)
+        """
+        self.window_count = window_count
+        self.count_strategy = count_strategy
+        super().__init__(*args, **kwargs)
+
     @property
     def is_list(self):
         return True
@@ -102,15 +275,11 @@ class StrawberryDjangoCountList(StrawberryDjangoField):
             return utils.get_django_model(type_)
         return None
 
-    def resolver(
-        self,
-        info,
-        source,
-        pk=strawberry.UNSET,
-        filters: Type = strawberry.UNSET,
-        order: Type = strawberry.UNSET,
-        pagination: Type = strawberry.UNSET,
-    ):
+    def get_base_queryset(self, info, pk, filters, only_extra_fields=()) -> models.QuerySet:
+        """
+        Filtered queryset (without ordering and pagination)
+        Only the columns required by the selected `items` fields are loaded
+        """
         if self.django_model is None or self._base_type is None:
             # This needs to be fixed by developers
             raise Exception('django_model should be defined!!')
@@ -123,26 +292,234 @@ class StrawberryDjangoCountList(StrawberryDjangoField):
         if get_queryset:
             queryset = get_queryset(type_, queryset, info)
 
-        queryset = self.apply_filters(queryset, filters, pk, info)
-        queryset = self.apply_order(queryset, order)
+        queryset = apply_only_fields(
+            queryset,
+            type_,
+            get_sub_selections(info.selected_fields[0].selections, 'items'),
+            extra_fields=only_extra_fields,
+        )
+        return self.apply_filters(queryset, filters, pk, info)
 
-        _current_queryset = copy.copy(queryset)
+    def resolver(
+        self,
+        info,
+        source,
+        pk=strawberry.UNSET,
+        filters: Type = strawberry.UNSET,
+        order: Type = strawberry.UNSET,
+        pagination: Type = strawberry.UNSET,
+    ):
+        queryset = self.get_base_queryset(info, pk, filters)
+        queryset = self.apply_order(queryset, order)
 
-        @sync_to_async
-        def get_count():
-            return _current_queryset.count()
+        # NOTE: copy.copy evaluates the queryset (QuerySet.__getstate__), clone instead
+        _current_queryset = queryset.all()
 
         pagination = process_pagination(pagination)
 
+        # NOTE: With DISTINCT, window is evaluated before the rows are de-duplicated
+        if (
+            self.window_count and
+            self.count_strategy == CountStrategy.EXACT and
+            not queryset.query.distinct
+        ):
+            page = WindowCountPage(
+                self.apply_pagination(WindowCountPage.annotate(queryset), pagination),
+                _current_queryset,
+                pagination.offset,
+            )
+            return CountList[self._base_type](
+                get_count=page.get_count,
+                get_items=page.get_items,
+                queryset=page.queryset,
+                limit=pagination.limit,
+                offset=pagination.offset,
+            )
+
+        queryset_count = QuerysetCount(_current_queryset, self.count_strategy)
+
         queryset = self.apply_pagination(queryset, pagination)
         return CountList[self._base_type](
-            get_count=get_count,
+            get_count=queryset_count.get_count,
+            get_count_is_exact=queryset_count.get_is_exact,
             queryset=queryset,
             limit=pagination.limit,
             offset=pagination.offset,
         )
 
 
+@strawberry.input
+class CursorPaginationInput:
+    after: str | None = None
+    limit: int = -1
+
+
+def encode_cursor(keys: list[str], values: list) -> str:
+    return base64.urlsafe_b64encode(
+        json.dumps([keys, values], cls=DjangoJSONEncoder).encode()
+    ).decode()
+
+
+def decode_cursor(cursor: str, keys: list[str]) -> list:
+    try:
+        cursor_keys, values = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except (ValueError, TypeError):
+        raise ValueError('Invalid cursor')
+    # Cursor generated using different ordering can't be used
+    if cursor_keys != keys or len(values) != len(keys):
+        raise ValueError('Cursor does not match the ordering')
+    return values
+
+
+def get_cursor_order_args(order) -> list[str]:
+    """
+    Ordering keys with a unique tie-breaker (pk) at the end
+    """
+    order_args = []
+    if order is not strawberry.UNSET and order is not None:
+        order_args = generate_order_args(order)
+    if not {'pk', 'id', '-pk', '-id'} & set(order_args):
+        order_args.append('pk')
+    return order_args
+
+
+def get_cursor_seek_filter(order_args: list[str], values: list) -> models.Q:
+    """
+    Row-value comparison (a, b, c) > (x, y, z) expanded to support mixed ASC/DESC:
+        a > x OR (a = x AND b > y) OR (a = x AND b = y AND c > z)
+    NOTE: Ordering keys should be non-nullable
+    """
+    seek_filter = models.Q()
+    for index, order_arg in enumerate(order_args):
+        key = order_arg.lstrip('-')
+        lookup = 'lt' if order_arg.startswith('-') else 'gt'
+        _filter = models.Q(**{
+            previous_order_arg.lstrip('-'): value
+            for previous_order_arg, value in zip(order_args[:index], values[:index])
+        })
+        seek_filter |= _filter & models.Q(**{f'{key}__{lookup}': values[index]})
+    return seek_filter
+
+
+def get_cursor_values(obj: models.Model, order_args: list[str]) -> list:
+    values = []
+    for order_arg in order_args:
+        value = obj
+        for attr in order_arg.lstrip('-').split('__'):
+            value = getattr(value, attr)
+        values.append(value)
+    return values
+
+
+class CursorPage:
+    """
+    Fetch limit + 1 rows once to find out if there is a next page.
+    """
+
+    def __init__(self, queryset: models.QuerySet, order_args: list[str], limit: int):
+        self.queryset = queryset
+        self.order_args = order_args
+        self.limit = limit
+        self._items = None
+        self._has_next = False
+        self._lock = asyncio.Lock()
+
+    async def get_items(self) -> list:
+        async with self._lock:
+            if self._items is None:
+                items = [
+                    d
+                    async for d in self.queryset[:self.limit + 1]
+                ]
+                self._has_next = len(items) > self.limit
+                self._items = items[:self.limit]
+        return self._items
+
+    async def get_has_next(self) -> bool:
+        await self.get_items()
+        return self._has_next
+
+    async def get_next_cursor(self) -> str | None:
+        items = await self.get_items()
+        if not self._has_next:
+            return
+        return encode_cursor(
+            self.order_args,
+            get_cursor_values(items[-1], self.order_args),
+        )
+
+
+@strawberry.type
+class CursorList(Generic[DjangoModelTypeVar]):
+    limit: int
+    page: strawberry.Private[CursorPage]
+
+    @strawberry.field
+    async def has_next(self) -> bool:
+        return await self.page.get_has_next()
+
+    @strawberry.field
+    async def next_cursor(self) -> str | None:
+        return await self.page.get_next_cursor()
+
+    @strawberry.field
+    async def items(self) -> list[DjangoModelTypeVar]:
+        return await self.page.get_items()
+
+
+class StrawberryDjangoCursorList(StrawberryDjangoCountList):
+    """
+    Keyset pagination: Seek using the ordering keys instead of OFFSET,
+    so deep pages cost the same as the first page.
+    """
+
+    @property
+    def arguments(self):
+        return [
+            *super().arguments,
+            argument('pagination', CursorPaginationInput),
+        ]
+
+    def resolver(
+        self,
+        info,
+        source,
+        pk=strawberry.UNSET,
+        filters: Type = strawberry.UNSET,
+        order: Type = strawberry.UNSET,
+        pagination: Type = strawberry.UNSET,
+    ):
+        if pagination is strawberry.UNSET or pagination is None:
+            pagination = CursorPaginationInput()
+        limit = process_pagination_limit(pagination.limit)
+
+        order_args = get_cursor_order_args(order)
+        queryset = self.get_base_queryset(
+            info,
+            pk,
+            filters,
+            # Required to generate the next cursor
+            only_extra_fields=[
+                order_arg.lstrip('-')
+                for order_arg in order_args
+                if '__' not in order_arg
+            ],
+        )
+        queryset = queryset.order_by(*order_args)
+        if pagination.after:
+            queryset = queryset.filter(
+                get_cursor_seek_filter(
+                    order_args,
+                    decode_cursor(pagination.after, order_args),
+                )
+            )
+
+        return CursorList[self._base_type](
+            page=CursorPage(queryset, order_args, limit),
+            limit=limit,
+        )
+
+
 def pagination_field(
     resolver=None, *, name=None, field_name=None, filters=strawberry.UNSET, default=strawberry.UNSET, **kwargs
 ) -> Any:
@@ -159,3 +536,21 @@ def pagination_field(
         resolver = django_resolver(resolver)
         return field_(resolver)
     return field_
+
+
+def cursor_pagination_field(
+    resolver=None, *, name=None, field_name=None, filters=strawberry.UNSET, default=strawberry.UNSET, **kwargs
+) -> Any:
+    field_ = StrawberryDjangoCursorList(
+        python_name=None,
+        graphql_name=name,
+        type_annotation=None,
+        filters=filters,
+        django_name=field_name,
+        default=default,
+        **kwargs,
+    )
+    if resolver:
+        resolver = django_resolver(resolver)
+        return field_(resolver)
+    return field_